@@ -9,26 +9,35 @@ Note: RFC 2047 encoded text in subject/body fields is not decoded and may
 appear in encoded form. This is a known limitation.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 from datetime import datetime
 import json
 import email.utils
 import os
+import uuid
 
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extras import RealDictCursor, register_default_json, register_default_jsonb
     from psycopg2 import sql
 except ImportError:
     psycopg2 = None
     RealDictCursor = None
+    register_default_json = None
+    register_default_jsonb = None
     sql = None
 
-from ..models.email_model import EmailData
+from .. import json_utils
+from ..models.email_model import EmailData, _split_addresses
 
 logger = logging.getLogger(__name__)
 
 
+def _cursor_name() -> str:
+    """Unique server-side cursor name, so several live streams can share a connection."""
+    return f"emails_{uuid.uuid4().hex}"
+
+
 class PostgresEmailIntake:
     """
     Utility class for retrieving emails from Postgres email_gmail table.
@@ -85,6 +94,9 @@ class PostgresEmailIntake:
         """Establish connection to the database."""
         try:
             self._connection = psycopg2.connect(**self.connection_params)
+            # Decode json/jsonb columns (headers, json_object) with orjson when available
+            register_default_json(self._connection, loads=json_utils.loads)
+            register_default_jsonb(self._connection, loads=json_utils.loads)
             logger.info("Database connection established")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
@@ -158,30 +170,45 @@ class PostgresEmailIntake:
         Returns:
             List of EmailData objects
         """
+        emails = list(self.iter_emails_by_email_id(email_id))
+        logger.info(f"Fetched {len(emails)} email(s) for email_id={email_id}")
+        return emails
+    
+    def iter_emails_by_email_id(self, email_id: int, itersize: int = 500) -> Iterator[EmailData]:
+        """
+        Stream emails from email_gmail table where email_id matches.
+        
+        Rows are read through a server-side cursor, itersize rows per
+        round trip, and mapped as they arrive, so the full result set is
+        never held in memory. Rows that fail to map are logged and skipped.
+        
+        Args:
+            email_id: The email_id to filter by
+            itersize: Number of rows fetched from the server at a time
+            
+        Yields:
+            EmailData objects
+        """
         if not self._connection:
             raise RuntimeError("Not connected to database. Call connect() first or use context manager.")
         
         try:
-            with self._connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection.cursor(name=_cursor_name(),
+                                         cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize
+                
                 # Build query with parameterized email_id to prevent SQL injection
                 query = self._build_email_query("m.email_id = %s")
                 
                 cursor.execute(query, (email_id,))
-                rows = cursor.fetchall()
-                
-                logger.info(f"Fetched {len(rows)} email(s) for email_id={email_id}")
                 
-                emails = []
-                for row in rows:
+                for row in cursor:
                     try:
-                        email_data = self._map_row_to_email_data(row)
-                        emails.append(email_data)
+                        yield self._map_row_to_email_data(row)
                     except Exception as e:
                         logger.error(f"Failed to map row em_id={row.get('em_id')}: {e}")
                         continue
                 
-                return emails
-                
         except Exception as e:
             logger.error(f"Failed to fetch emails: {e}")
             raise
@@ -220,7 +247,7 @@ class PostgresEmailIntake:
                 headers = row['headers']
             elif isinstance(row['headers'], str):
                 try:
-                    headers = json.loads(row['headers'])
+                    headers = json_utils.loads(row['headers'])
                 except json.JSONDecodeError:
                     logger.warning(f"Failed to parse headers for em_id={row.get('em_id')}")
         
@@ -234,15 +261,15 @@ class PostgresEmailIntake:
         if headers:
             to_header = headers.get('To', headers.get('to', ''))
             if to_header:
-                recipients = [addr.strip() for addr in to_header.split(',') if addr.strip()]
+                recipients = _split_addresses(to_header)
             
             cc_header = headers.get('Cc', headers.get('cc', ''))
             if cc_header:
-                cc_recipients = [addr.strip() for addr in cc_header.split(',') if addr.strip()]
+                cc_recipients = _split_addresses(cc_header)
             
             bcc_header = headers.get('Bcc', headers.get('bcc', ''))
             if bcc_header:
-                bcc_recipients = [addr.strip() for addr in bcc_header.split(',') if addr.strip()]
+                bcc_recipients = _split_addresses(bcc_header)
             
             # Try to extract sent date from headers
             date_header = headers.get('Date', headers.get('date', ''))
@@ -257,30 +284,18 @@ class PostgresEmailIntake:
             try:
                 json_obj = row['json_object']
                 if isinstance(json_obj, str):
-                    json_obj = json.loads(json_obj)
+                    json_obj = json_utils.loads(json_obj)
                 
                 # Try various common fields in json_object
                 if 'to' in json_obj:
-                    to_val = json_obj['to']
-                    if isinstance(to_val, list):
-                        recipients = to_val
-                    elif isinstance(to_val, str):
-                        recipients = [addr.strip() for addr in to_val.split(',') if addr.strip()]
+                    recipients = _split_addresses(json_obj['to'])
                 
                 if 'cc' in json_obj:
-                    cc_val = json_obj['cc']
-                    if isinstance(cc_val, list):
-                        cc_recipients = cc_val
-                    elif isinstance(cc_val, str):
-                        cc_recipients = [addr.strip() for addr in cc_val.split(',') if addr.strip()]
+                    cc_recipients = _split_addresses(json_obj['cc'])
                 
                 if 'bcc' in json_obj:
-                    bcc_val = json_obj['bcc']
-                    if isinstance(bcc_val, list):
-                        bcc_recipients = bcc_val
-                    elif isinstance(bcc_val, str):
-                        bcc_recipients = [addr.strip() for addr in bcc_val.split(',') if addr.strip()]
-                        
+                    bcc_recipients = _split_addresses(json_obj['bcc'])
+
             except (json.JSONDecodeError, KeyError, TypeError) as e:
                 logger.debug(f"Could not extract recipients from json_object: {e}")
         
@@ -324,11 +339,33 @@ class PostgresEmailIntake:
         Returns:
             List of EmailData objects
         """
+        emails = list(self.iter_all_emails(limit=limit))
+        logger.info(f"Fetched {len(emails)} email(s) from database")
+        return emails
+    
+    def iter_all_emails(self, limit: Optional[int] = None, itersize: int = 500) -> Iterator[EmailData]:
+        """
+        Stream all emails from email_gmail table.
+        
+        Like iter_emails_by_email_id, rows come through a server-side cursor
+        itersize rows at a time instead of one fetchall(). Rows that fail to
+        map are logged and skipped.
+        
+        Args:
+            limit: Optional limit on number of emails to fetch
+            itersize: Number of rows fetched from the server at a time
+            
+        Yields:
+            EmailData objects
+        """
         if not self._connection:
             raise RuntimeError("Not connected to database. Call connect() first or use context manager.")
         
         try:
-            with self._connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection.cursor(name=_cursor_name(),
+                                         cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize
+                
                 # Build query without WHERE clause
                 query = self._build_email_query()
                 
@@ -340,21 +377,13 @@ class PostgresEmailIntake:
                 else:
                     cursor.execute(query)
                 
-                rows = cursor.fetchall()
-                
-                logger.info(f"Fetched {len(rows)} email(s) from database")
-                
-                emails = []
-                for row in rows:
+                for row in cursor:
                     try:
-                        email_data = self._map_row_to_email_data(row)
-                        emails.append(email_data)
+                        yield self._map_row_to_email_data(row)
                     except Exception as e:
                         logger.error(f"Failed to map row em_id={row.get('em_id')}: {e}")
                         continue
                 
-                return emails
-                
         except Exception as e:
             logger.error(f"Failed to fetch emails: {e}")
             raise
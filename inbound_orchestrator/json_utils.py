@@ -0,0 +1,67 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the
+standard library otherwise.
+"""
+import json
+from datetime import date, time
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Args:
+        data: JSON text as string or bytes (bytes are parsed without decoding
+            first when orjson is available)
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(value: Any) -> str:
+    """Encode values JSON can't represent: ISO 8601 for dates and times, str otherwise."""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Output is the same with and without orjson: compact separators, non-ASCII
+    characters left as-is, and dates/datetimes as ISO 8601 strings. Other
+    values JSON can't represent natively are converted with ``str``. NaN and
+    infinity are not supported consistently (orjson writes ``null``).
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with a 2-space indent; only 2 (or None) is
+            accepted, as that is all orjson supports
+
+    Returns:
+        JSON string
+
+    Raises:
+        ValueError: If indent is neither None nor 2
+    """
+    if indent not in (None, 2):
+        raise ValueError(f"indent must be None or 2, got {indent!r}")
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+    separators = (',', ': ') if indent else (',', ':')
+    return json.dumps(obj, indent=indent, default=_default, ensure_ascii=False,
+                      separators=separators)
@@ -1,14 +1,56 @@
 """
 Email data model for representing email objects in the rules engine.
 """
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, fields
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 import email
 from email.message import EmailMessage
 import json
 
 
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ for its fields.
+    
+    Equivalent to @dataclass(slots=True), which needs Python 3.10+. Field
+    defaults live in the generated __init__, so the class attributes that
+    would clash with the slots can be dropped.
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def _split_addresses(header: Union[str, List[str], None]) -> List[str]:
+    """
+    Split a comma-separated address header, dropping empty entries.
+    
+    Lists (e.g. addresses from JSON headers) are returned unchanged, and
+    any other non-string value gives an empty list.
+    """
+    if isinstance(header, list):
+        return header
+    if not isinstance(header, str):
+        return []
+    addresses = []
+    while header:
+        address, _, header = header.partition(',')
+        address = address.strip()
+        if address:
+            addresses.append(address)
+    return addresses
+
+
+@_slotted
 @dataclass
 class EmailAttachment:
     """Represents an email attachment."""
@@ -27,6 +69,7 @@ class EmailAttachment:
         }
 
 
+@_slotted
 @dataclass
 class EmailData:
     """
@@ -78,18 +121,11 @@ class EmailData:
         subject = message.get('Subject', '').strip()
         sender = message.get('From', '').strip()
         
-        # Parse recipients
-        recipients = []
-        if message.get('To'):
-            recipients = [addr.strip() for addr in message.get('To').split(',')]
-        
-        cc_recipients = []
-        if message.get('Cc'):
-            cc_recipients = [addr.strip() for addr in message.get('Cc').split(',')]
-            
-        bcc_recipients = []
-        if message.get('Bcc'):
-            bcc_recipients = [addr.strip() for addr in message.get('Bcc').split(',')]
+        # Parse recipients (each header is fetched once; with the default
+        # policy every message.get() re-parses the header)
+        recipients = _split_addresses(message.get('To'))
+        cc_recipients = _split_addresses(message.get('Cc'))
+        bcc_recipients = _split_addresses(message.get('Bcc'))
         
         # Extract body content
         body_text = ""
@@ -98,14 +134,19 @@ class EmailData:
         # Helper to get content from both old and new email API
         def get_part_content(part):
             """Get content from email part, compatible with both old and new API."""
-            if hasattr(part, 'get_content'):
-                return part.get_content()
-            else:
-                # Fallback to get_payload for older API
-                payload = part.get_payload(decode=True)
-                if isinstance(payload, bytes):
-                    return payload.decode('utf-8', errors='ignore')
-                return payload or ""
+            # get_content assumes ASCII when no charset is declared, so
+            # undeclared parts are decoded from the raw payload as UTF-8
+            if hasattr(part, 'get_content') and part.get_content_charset():
+                try:
+                    return part.get_content()
+                except (LookupError, ValueError):
+                    # Unknown charset or undecodable part; use the raw payload
+                    pass
+            # Fallback to get_payload for older API
+            payload = part.get_payload(decode=True)
+            if isinstance(payload, bytes):
+                return payload.decode('utf-8', errors='ignore')
+            return payload or ""
         
         if message.is_multipart():
             for part in message.walk():
@@ -130,7 +171,7 @@ class EmailData:
                 pass
         
         # Extract headers
-        headers = dict(message.items())
+        headers = {name: str(value) for name, value in message.items()}
         
         # Extract attachments
         attachments = []
@@ -139,18 +180,15 @@ class EmailData:
                 if part.get_content_disposition() == 'attachment':
                     filename = part.get_filename()
                     if filename:
-                        # Get content compatible with both APIs
-                        if hasattr(part, 'get_content'):
-                            content = part.get_content()
-                        else:
-                            content = part.get_payload(decode=True)
-                        
-                        content_len = len(content) if content and hasattr(content, '__len__') else 0
+                        # Raw decoded bytes: get_content() would decode text parts
+                        # (failing on unknown charsets) and return a message object
+                        # for message/rfc822, whose payload here is None
+                        content = part.get_payload(decode=True) or b""
                         attachment = EmailAttachment(
                             filename=filename,
                             content_type=part.get_content_type(),
-                            size=content_len,
-                            content=content if isinstance(content, bytes) else content.encode('utf-8') if content else b""
+                            size=len(content),
+                            content=content
                         )
                         attachments.append(attachment)
         
@@ -174,7 +212,7 @@ class EmailData:
             bcc_recipients=bcc_recipients,
             body_text=body_text,
             body_html=body_html,
-            message_id=message.get('Message-ID', ''),
+            message_id=str(message.get('Message-ID', '')),
             received_date=received_date,
             sent_date=sent_date,
             headers=headers,
@@ -233,6 +271,11 @@ class EmailData:
         Returns:
             Dictionary representation of the email data
         """
+        recipient_count = len(self.recipients)
+        cc_count = len(self.cc_recipients)
+        bcc_count = len(self.bcc_recipients)
+        attachment_count = len(self.attachments)
+        
         return {
             # Basic properties
             'subject': self.subject,
@@ -247,12 +290,12 @@ class EmailData:
             'priority': self.priority,
             
             # Computed properties for rule evaluation
-            'recipient_count': len(self.recipients),
-            'cc_count': len(self.cc_recipients),
-            'bcc_count': len(self.bcc_recipients),
-            'total_recipients': len(self.recipients) + len(self.cc_recipients) + len(self.bcc_recipients),
-            'has_attachments': len(self.attachments) > 0,
-            'attachment_count': len(self.attachments),
+            'recipient_count': recipient_count,
+            'cc_count': cc_count,
+            'bcc_count': bcc_count,
+            'total_recipients': recipient_count + cc_count + bcc_count,
+            'has_attachments': attachment_count > 0,
+            'attachment_count': attachment_count,
             'attachment_filenames': [att.filename for att in self.attachments],
             'attachment_types': [att.content_type for att in self.attachments],
             'total_attachment_size': sum(att.size for att in self.attachments),
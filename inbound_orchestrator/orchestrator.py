@@ -2,8 +2,13 @@
 Main InboundOrchestrator class that coordinates email processing and routing.
 """
 import logging
+import os
+import time
+from collections import Counter
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union, Callable
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable
 from datetime import datetime
 
 from .models.email_model import EmailData
@@ -14,6 +19,12 @@ from .utils.email_parser import EmailParser
 
 logger = logging.getLogger(__name__)
 
+# Smallest batch worth the cost of starting worker processes
+PARALLEL_BATCH_THRESHOLD = 64
+
+# Emails pulled from a Postgres stream per process_emails_batch call
+POSTGRES_BATCH_SIZE = 500
+
 
 class InboundOrchestrator:
     """
@@ -44,6 +55,13 @@ class InboundOrchestrator:
         self.default_queue = default_queue
         self.config_file = Path(config_file) if config_file else None
         
+        # Kept so worker processes can build an equivalent SQS client
+        self._aws_kwargs = {
+            'aws_region': aws_region,
+            'aws_access_key_id': aws_access_key_id,
+            'aws_secret_access_key': aws_secret_access_key
+        }
+        
         # Initialize components
         self.rule_engine = EmailRuleEngine()
         self.sqs_client = SQSClient(
@@ -52,15 +70,13 @@ class InboundOrchestrator:
             aws_secret_access_key=aws_secret_access_key
         )
         
+        # SQS client (and its boto3 client) that worker processes can rebuild
+        # from _aws_kwargs; see _check_parallel_state
+        self._built_sqs_client = self.sqs_client
+        self._built_sqs = self.sqs_client.sqs
+        
         # Statistics tracking
-        self.stats = {
-            'total_processed': 0,
-            'successful_routes': 0,
-            'failed_routes': 0,
-            'rule_matches': {},
-            'queue_usage': {},
-            'start_time': datetime.now()
-        }
+        self._reset_counters()
         
         # Load configuration if provided
         if self.config_file and self.config_file.exists():
@@ -152,7 +168,25 @@ class InboundOrchestrator:
         Returns:
             Dictionary containing processing results
         """
-        start_time = datetime.now()
+        return self._process_email(email_data, dry_run, custom_attributes)
+    
+    def _process_email(self, email_data: EmailData,
+                       dry_run: bool = False,
+                       custom_attributes: Optional[Dict[str, Any]] = None,
+                       active_rules: Optional[List[Tuple[EmailRule, Any]]] = None) -> Dict[str, Any]:
+        """
+        Process a single email, optionally with rules precomputed by the caller.
+        
+        Args:
+            email_data: EmailData object to process
+            dry_run: If True, don't actually send to SQS, just return routing decision
+            custom_attributes: Additional attributes to include with the message
+            active_rules: Result of rule_engine.get_active_rules() (optional)
+            
+        Returns:
+            Dictionary containing processing results
+        """
+        start_time = time.perf_counter()
         result = {
             'email_id': email_data.message_id,
             'subject': email_data.subject[:100],
@@ -167,13 +201,19 @@ class InboundOrchestrator:
         }
         
         try:
+            if active_rules is None:
+                active_rules = self.rule_engine.get_active_rules()
+            
+            # Serialize once for both rule evaluation and the SQS message body
+            email_dict = email_data.to_dict() if active_rules or not dry_run else None
+            
             # Evaluate rules
-            matching_rules = self.rule_engine.evaluate_email(email_data)
+            matching_rules = self.rule_engine.evaluate_email(email_data, active_rules, email_dict)
             result['matched_rules'] = [rule.name for rule in matching_rules]
             
             # Update rule match statistics
             for rule in matching_rules:
-                self.stats['rule_matches'][rule.name] = self.stats['rule_matches'].get(rule.name, 0) + 1
+                self._rule_matches[rule.name] += 1
             
             # Determine queue (first matching rule or default)
             if matching_rules:
@@ -191,55 +231,73 @@ class InboundOrchestrator:
                 success = self.sqs_client.send_email_message(
                     email_data=email_data,
                     queue_name=queue_name,
-                    additional_attributes=custom_attributes
+                    additional_attributes=custom_attributes,
+                    email_dict=email_dict
                 )
                 
                 if success:
-                    self.stats['successful_routes'] += 1
-                    self.stats['queue_usage'][queue_name] = self.stats['queue_usage'].get(queue_name, 0) + 1
+                    self._successful_routes += 1
+                    self._queue_usage[queue_name] += 1
                     result['success'] = True
                 else:
-                    self.stats['failed_routes'] += 1
+                    self._failed_routes += 1
                     result['error'] = f"Failed to send message to queue '{queue_name}'"
             else:
                 result['success'] = True  # Dry run is always "successful"
             
-            self.stats['total_processed'] += 1
+            self._total_processed += 1
             
         except Exception as e:
             error_msg = f"Error processing email: {str(e)}"
             logger.error(error_msg)
             result['error'] = error_msg
             result['success'] = False
-            self.stats['failed_routes'] += 1
+            self._failed_routes += 1
         
         finally:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             result['processing_time'] = processing_time
         
         return result
     
     def process_emails_batch(self, emails: List[EmailData],
                            dry_run: bool = False,
-                           parallel: bool = False) -> List[Dict[str, Any]]:
+                           parallel: bool = False,
+                           max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Process multiple emails in batch.
         
         Args:
             emails: List of EmailData objects to process
             dry_run: If True, don't actually send to SQS
-            parallel: If True, process emails in parallel (future enhancement)
+            parallel: If True, batches of at least PARALLEL_BATCH_THRESHOLD
+                emails are split across worker processes. Each worker
+                rebuilds the orchestrator from the rules, queues, default
+                queue, AWS settings and rule engine memoize settings (not
+                memoized results); see _check_parallel_state
+            max_workers: Number of worker processes (default: CPU count)
             
         Returns:
             List of processing results
+            
+        Raises:
+            ValueError: If parallel processing can't reproduce this
+                orchestrator's rule engine or SQS client
         """
+        if parallel and len(emails) >= PARALLEL_BATCH_THRESHOLD:
+            self._check_parallel_state(dry_run)
+            return self._process_emails_parallel(emails, dry_run, max_workers)
+        
         results = []
         
         logger.info(f"Processing batch of {len(emails)} emails (dry_run={dry_run})")
         
+        # Rule order and compiled conditions are the same for every email
+        active_rules = self.rule_engine.get_active_rules()
+        
         for i, email_data in enumerate(emails):
             try:
-                result = self.process_email(email_data, dry_run=dry_run)
+                result = self._process_email(email_data, dry_run=dry_run, active_rules=active_rules)
                 results.append(result)
                 
                 if i % 100 == 0 and i > 0:
@@ -259,6 +317,73 @@ class InboundOrchestrator:
         
         return results
     
+    def _check_parallel_state(self, dry_run: bool) -> None:
+        """
+        Refuse parallel processing when workers would behave differently.
+        
+        Workers build a plain EmailRuleEngine and, for real sends, a fresh
+        SQSClient from the AWS settings given to __init__. A replaced rule
+        engine, or a replaced or patched SQS client, would be silently
+        dropped, so those raise ValueError instead.
+        """
+        if type(self.rule_engine) is not EmailRuleEngine:
+            raise ValueError("parallel=True needs an EmailRuleEngine; worker processes "
+                             "rebuild it from the exported rules")
+        if not dry_run and (self.sqs_client is not self._built_sqs_client
+                            or self.sqs_client.sqs is not self._built_sqs):
+            raise ValueError("parallel=True can't send through a replaced SQS client; worker "
+                             "processes build their own from the AWS settings")
+    
+    def _process_emails_parallel(self, emails: List[EmailData],
+                                 dry_run: bool,
+                                 max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process a batch across worker processes.
+        
+        Each worker rebuilds an orchestrator with the same rules, queues,
+        AWS settings and memoize settings once, then processes contiguous
+        chunks of the batch.
+        Results keep the input order and worker statistics are merged into
+        this orchestrator's.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        chunk_size = -(-len(emails) // max_workers)
+        chunks = [emails[i:i + chunk_size] for i in range(0, len(emails), chunk_size)]
+        
+        state = {
+            'aws_kwargs': self._aws_kwargs,
+            'default_queue': self.default_queue,
+            'rules': self.rule_engine.export_rules(),
+            'memoize': self.rule_engine._memo is not None,
+            'memo_size': self.rule_engine._memo_size,
+            'queues': [queue.to_dict() for queue in self.sqs_client.list_queues()]
+        }
+        
+        logger.info(f"Processing batch of {len(emails)} emails in {len(chunks)} worker chunks "
+                    f"(dry_run={dry_run})")
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_batch_worker,
+                                 initargs=(state,)) as executor:
+            for chunk_results, chunk_stats in executor.map(_process_batch_chunk, chunks,
+                                                           [dry_run] * len(chunks)):
+                results.extend(chunk_results)
+                self._merge_statistics(chunk_stats)
+        
+        successful = sum(1 for r in results if r['success'])
+        logger.info(f"Batch processing complete: {successful}/{len(emails)} successful")
+        
+        return results
+    
+    def _merge_statistics(self, stats: Dict[str, Any]) -> None:
+        """Add statistics gathered by another orchestrator to this one."""
+        self._total_processed += stats['total_processed']
+        self._successful_routes += stats['successful_routes']
+        self._failed_routes += stats['failed_routes']
+        self._rule_matches.update(stats['rule_matches'])
+        self._queue_usage.update(stats['queue_usage'])
+    
     def process_email_from_file(self, file_path: Union[str, Path],
                               dry_run: bool = False) -> Dict[str, Any]:
         """
@@ -297,7 +422,8 @@ class InboundOrchestrator:
         Process emails from Postgres database through the rules engine.
         
         Args:
-            postgres_intake: PostgresEmailIntake instance (connected)
+            postgres_intake: PostgresEmailIntake instance (connected), or any
+                object with iter_emails_by_email_id or fetch_emails_by_email_id
             email_id: Email ID to filter by
             dry_run: If True, don't actually send to SQS
             
@@ -307,10 +433,24 @@ class InboundOrchestrator:
         logger.info(f"Processing Postgres emails for email_id={email_id}")
         
         try:
-            # Fetch emails from database
-            emails = postgres_intake.fetch_emails_by_email_id(email_id)
+            # Stream emails from the database and process them in batches;
+            # intakes without iter_emails_by_email_id are fetched as a list
+            iter_emails = getattr(postgres_intake, 'iter_emails_by_email_id', None)
+            if iter_emails is not None:
+                emails = iter(iter_emails(email_id))
+            else:
+                emails = iter(postgres_intake.fetch_emails_by_email_id(email_id))
+            email_count = 0
+            results = []
+            
+            while True:
+                batch = list(islice(emails, POSTGRES_BATCH_SIZE))
+                if not batch:
+                    break
+                email_count += len(batch)
+                results.extend(self.process_emails_batch(batch, dry_run=dry_run))
             
-            if not emails:
+            if not email_count:
                 logger.warning(f"No emails found for email_id={email_id}")
                 return {
                     'email_id': email_id,
@@ -321,22 +461,19 @@ class InboundOrchestrator:
                     'results': []
                 }
             
-            # Process emails through rules engine
-            results = self.process_emails_batch(emails, dry_run=dry_run)
-            
             # Summarize results
             successful = sum(1 for r in results if r['success'])
             
             summary = {
                 'email_id': email_id,
-                'email_count': len(emails),
+                'email_count': email_count,
                 'processed': len(results),
                 'successful': successful,
                 'failed': len(results) - successful,
                 'results': results
             }
             
-            logger.info(f"Processed {len(emails)} Postgres emails: {successful} successful, {len(results) - successful} failed")
+            logger.info(f"Processed {email_count} Postgres emails: {successful} successful, {len(results) - successful} failed")
             
             return summary
             
@@ -373,9 +510,16 @@ class InboundOrchestrator:
             'error_details': []
         }
         
+        # Compile once instead of once per email
+        try:
+            compiled_condition = self.rule_engine.compile_condition(rule_condition)
+        except Exception as e:
+            logger.error(f"Error testing rule: {e}")
+            return results
+        
         for email_data in test_emails:
             try:
-                if self.rule_engine.test_rule(rule_condition, email_data):
+                if self.rule_engine.test_rule(compiled_condition, email_data):
                     results['matches'] += 1
                     results['matching_emails'].append({
                         'subject': email_data.subject,
@@ -388,33 +532,48 @@ class InboundOrchestrator:
         
         return results
     
+    def _reset_counters(self) -> None:
+        """Zero the statistics counters and restart the uptime clock."""
+        # Plain int attributes and Counters keep the per-email bookkeeping cheap
+        self._total_processed = 0
+        self._successful_routes = 0
+        self._failed_routes = 0
+        self._rule_matches = Counter()
+        self._queue_usage = Counter()
+        self._start_time = datetime.now()
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the raw statistics counters."""
+        return {
+            'total_processed': self._total_processed,
+            'successful_routes': self._successful_routes,
+            'failed_routes': self._failed_routes,
+            'rule_matches': dict(self._rule_matches),
+            'queue_usage': dict(self._queue_usage),
+            'start_time': self._start_time
+        }
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get processing statistics."""
-        uptime = (datetime.now() - self.stats['start_time']).total_seconds()
+        uptime = (datetime.now() - self._start_time).total_seconds()
         
         return {
             'uptime_seconds': uptime,
-            'total_processed': self.stats['total_processed'],
-            'successful_routes': self.stats['successful_routes'],
-            'failed_routes': self.stats['failed_routes'],
-            'success_rate': (self.stats['successful_routes'] / max(1, self.stats['total_processed'])) * 100,
-            'rule_matches': self.stats['rule_matches'].copy(),
-            'queue_usage': self.stats['queue_usage'].copy(),
-            'rules_count': len(self.rule_engine.list_rules()),
-            'queues_count': len(self.sqs_client.list_queues()),
+            'total_processed': self._total_processed,
+            'successful_routes': self._successful_routes,
+            'failed_routes': self._failed_routes,
+            'success_rate': (self._successful_routes / max(1, self._total_processed)) * 100,
+            'rule_matches': dict(self._rule_matches),
+            'queue_usage': dict(self._queue_usage),
+            'rules_count': len(self.rule_engine.rules),
+            'queues_count': len(self.sqs_client.queues),
             'enabled_rules_count': len(self.rule_engine.list_rules(enabled_only=True))
         }
     
     def reset_statistics(self) -> None:
         """Reset processing statistics."""
-        self.stats = {
-            'total_processed': 0,
-            'successful_routes': 0,
-            'failed_routes': 0,
-            'rule_matches': {},
-            'queue_usage': {},
-            'start_time': datetime.now()
-        }
+        self._reset_counters()
         logger.info("Statistics reset")
     
     def health_check(self) -> Dict[str, Any]:
@@ -436,7 +595,7 @@ class InboundOrchestrator:
             health['components']['rule_engine'] = {
                 'status': 'healthy',
                 'enabled_rules': len(rules),
-                'total_rules': len(self.rule_engine.list_rules())
+                'total_rules': len(self.rule_engine.rules)
             }
         except Exception as e:
             health['components']['rule_engine'] = {
@@ -482,4 +641,29 @@ class InboundOrchestrator:
     
     def __repr__(self) -> str:
         """Detailed representation of the orchestrator."""
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+# Orchestrator rebuilt in each worker process by _init_batch_worker
+_worker_orchestrator = None
+
+
+def _init_batch_worker(state: Dict[str, Any]) -> None:
+    """Build the worker process's orchestrator from a parent's batch state."""
+    global _worker_orchestrator
+    _worker_orchestrator = InboundOrchestrator(
+        default_queue=state['default_queue'],
+        **state['aws_kwargs']
+    )
+    _worker_orchestrator.rule_engine = EmailRuleEngine(memoize=state['memoize'],
+                                                       memo_size=state['memo_size'])
+    _worker_orchestrator.rule_engine.add_rules(state['rules'])
+    for queue in state['queues']:
+        _worker_orchestrator.add_queue(queue)
+
+
+def _process_batch_chunk(emails: List[EmailData], dry_run: bool) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Process a chunk of emails in a worker, returning its results and statistics."""
+    _worker_orchestrator.reset_statistics()
+    results = _worker_orchestrator.process_emails_batch(emails, dry_run=dry_run)
+    return results, _worker_orchestrator.stats
@@ -4,16 +4,100 @@ Email rule engine using the rule-engine PyPI package.
 This module provides integration with the rule-engine library to evaluate
 custom rules against email objects for routing decisions.
 """
+import bisect
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union
+from functools import lru_cache
+from typing import AbstractSet, Iterator, List, Dict, Any, Optional, Tuple, Union
 import rule_engine
 import logging
 
-from ..models.email_model import EmailData
+from .. import json_utils
+from ..models.email_model import EmailData, _slotted
 
 logger = logging.getLogger(__name__)
 
+# Longer texts (typically bodies) bypass the helper caches: they are rarely
+# repeated and would pin large strings in memory
+_CACHEABLE_TEXT_LENGTH = 1024
 
+
+@lru_cache(maxsize=4096)
+def _cached_contains(text: str, keyword: str) -> bool:
+    return keyword.lower() in text.lower()
+
+
+@lru_cache(maxsize=4096)
+def _cached_starts_with(text: str, prefix: str) -> bool:
+    return text.lower().startswith(prefix.lower())
+
+
+@lru_cache(maxsize=4096)
+def _cached_ends_with(text: str, suffix: str) -> bool:
+    return text.lower().endswith(suffix.lower())
+
+
+@lru_cache(maxsize=512)
+def _compile_condition(condition: str) -> rule_engine.Rule:
+    """Parse a condition once; compiled rules are immutable and can be shared."""
+    return rule_engine.Rule(condition)
+
+
+@lru_cache(maxsize=512)
+def _is_valid_condition(condition: str) -> bool:
+    """Cached syntax check; unlike _compile_condition, failures are cached too."""
+    try:
+        _compile_condition(condition)
+        return True
+    except rule_engine.RuleSyntaxError:
+        return False
+
+
+def _cacheable(text: Any, other: Any) -> bool:
+    """Whether a helper call can go through the LRU cache."""
+    return (type(text) is str and type(other) is str
+            and len(text) <= _CACHEABLE_TEXT_LENGTH)
+
+
+def contains(text: str, keyword: str) -> bool:
+    """Case-insensitive substring check available to rule conditions."""
+    if _cacheable(text, keyword):
+        return _cached_contains(text, keyword)
+    return keyword.lower() in text.lower()
+
+
+def starts_with(text: str, prefix: str) -> bool:
+    """Case-insensitive prefix check available to rule conditions."""
+    if _cacheable(text, prefix):
+        return _cached_starts_with(text, prefix)
+    return text.lower().startswith(prefix.lower())
+
+
+def ends_with(text: str, suffix: str) -> bool:
+    """Case-insensitive suffix check available to rule conditions."""
+    if _cacheable(text, suffix):
+        return _cached_ends_with(text, suffix)
+    return text.lower().endswith(suffix.lower())
+
+
+# Email-independent part of the evaluation context; copied per email
+_CONTEXT_TEMPLATE = {
+    'contains': contains,
+    'starts_with': starts_with,
+    'ends_with': ends_with,
+}
+
+# Per-email context symbols whose values depend on several email fields;
+# rules using them are re-evaluated whenever any field changes
+_EMAIL_BOUND_SYMBOLS = frozenset({
+    'matches_pattern', 'has_keyword', 'has_attachment_type',
+    'is_gmail', 'is_outlook', 'is_internal',
+    'is_weekend', 'is_business_hours', 'is_after_hours',
+})
+
+
+@_slotted
 @dataclass
 class EmailRule:
     """
@@ -36,9 +120,15 @@ class EmailRule:
     metadata: Optional[Dict[str, Any]] = None
     
     def __post_init__(self):
-        """Initialize metadata if not provided."""
+        """Initialize metadata if not provided and intern the lookup strings."""
         if self.metadata is None:
             self.metadata = {}
+        # name/action/condition are used as dict keys (compiled rules, memo,
+        # queues, statistics); interned copies compare by identity
+        for field_name in ('name', 'action', 'condition'):
+            value = getattr(self, field_name)
+            if type(value) is str:
+                setattr(self, field_name, sys.intern(value))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert rule to dictionary."""
@@ -74,10 +164,27 @@ class EmailRuleEngine:
     logic for processing emails and triggering routing actions.
     """
     
-    def __init__(self):
-        """Initialize the rule engine."""
+    def __init__(self, memoize: bool = False, memo_size: int = 10_000):
+        """
+        Initialize the rule engine.
+        
+        Args:
+            memoize: Remember per-rule results by message ID, so retried or
+                duplicate emails skip re-evaluation
+            memo_size: Maximum number of remembered results (LRU eviction)
+        """
         self.rules: List[EmailRule] = []
+        self._by_name: Dict[str, EmailRule] = {}
         self._compiled_rules: Dict[str, rule_engine.Rule] = {}
+        
+        # self.rules ordered by priority (highest first, insertion order for
+        # ties), with the negated priority each rule was inserted at
+        self._sorted_rules: List[EmailRule] = []
+        self._sort_keys: List[int] = []
+        
+        # (rule name, message ID) -> match result, least recently used first
+        self._memo: Optional[OrderedDict] = OrderedDict() if memoize else None
+        self._memo_size = memo_size
     
     def add_rule(self, rule: EmailRule) -> None:
         """
@@ -85,17 +192,42 @@ class EmailRuleEngine:
         
         Args:
             rule: EmailRule to add
+            
+        Raises:
+            ValueError: If the condition is invalid or the name is already in use
         """
+        if rule.name in self._by_name:
+            raise ValueError(f"Rule '{rule.name}' already exists")
         try:
             # Compile the rule to validate syntax
-            compiled_rule = rule_engine.Rule(rule.condition)
+            compiled_rule = self.compile_condition(rule.condition)
             self._compiled_rules[rule.name] = compiled_rule
             self.rules.append(rule)
+            self._by_name[rule.name] = rule
+            self._insert_sorted(rule)
+            self._clear_memo()
             logger.info(f"Added rule: {rule.name}")
         except rule_engine.RuleSyntaxError as e:
             logger.error(f"Invalid rule syntax for '{rule.name}': {e}")
             raise ValueError(f"Invalid rule syntax for '{rule.name}': {e}")
     
+    def _insert_sorted(self, rule: EmailRule) -> None:
+        """Insert a rule into the priority-ordered list after rules of equal priority."""
+        key = -rule.priority
+        index = bisect.bisect_right(self._sort_keys, key)
+        self._sort_keys.insert(index, key)
+        self._sorted_rules.insert(index, rule)
+    
+    def _clear_memo(self) -> None:
+        """Forget memoized results after the rule set changes."""
+        if self._memo is not None:
+            self._memo.clear()
+    
+    def _rebuild_sorted(self) -> None:
+        """Rebuild the priority-ordered list from self.rules."""
+        self._sorted_rules = sorted(self.rules, key=lambda r: r.priority, reverse=True)
+        self._sort_keys = [-rule.priority for rule in self._sorted_rules]
+    
     def add_rules(self, rules: List[Union[EmailRule, Dict[str, Any]]]) -> None:
         """
         Add multiple rules to the engine.
@@ -118,39 +250,51 @@ class EmailRuleEngine:
         Returns:
             True if rule was found and removed, False otherwise
         """
-        for i, rule in enumerate(self.rules):
-            if rule.name == rule_name:
-                self.rules.pop(i)
-                if rule_name in self._compiled_rules:
-                    del self._compiled_rules[rule_name]
-                logger.info(f"Removed rule: {rule_name}")
-                return True
-        return False
+        rule = self._by_name.pop(rule_name, None)
+        if rule is None:
+            return False
+        
+        self.rules.remove(rule)
+        
+        # Look in the rule's priority bucket first; the priority may have been
+        # changed in place since it was inserted
+        key = -rule.priority
+        start = bisect.bisect_left(self._sort_keys, key)
+        end = bisect.bisect_right(self._sort_keys, key)
+        index = next((j for j in range(start, end) if self._sorted_rules[j] is rule), None)
+        if index is None:
+            index = next(j for j, sorted_rule in enumerate(self._sorted_rules) if sorted_rule is rule)
+        del self._sorted_rules[index]
+        del self._sort_keys[index]
+        
+        self._compiled_rules.pop(rule_name, None)
+        self._clear_memo()
+        logger.info(f"Removed rule: {rule_name}")
+        return True
     
     def enable_rule(self, rule_name: str) -> bool:
         """Enable a rule by name."""
-        for rule in self.rules:
-            if rule.name == rule_name:
-                rule.enabled = True
-                logger.info(f"Enabled rule: {rule_name}")
-                return True
-        return False
+        rule = self._by_name.get(rule_name)
+        if rule is None:
+            return False
+        rule.enabled = True
+        self._clear_memo()
+        logger.info(f"Enabled rule: {rule_name}")
+        return True
     
     def disable_rule(self, rule_name: str) -> bool:
         """Disable a rule by name."""
-        for rule in self.rules:
-            if rule.name == rule_name:
-                rule.enabled = False
-                logger.info(f"Disabled rule: {rule_name}")
-                return True
-        return False
+        rule = self._by_name.get(rule_name)
+        if rule is None:
+            return False
+        rule.enabled = False
+        self._clear_memo()
+        logger.info(f"Disabled rule: {rule_name}")
+        return True
     
     def get_rule(self, rule_name: str) -> Optional[EmailRule]:
         """Get a rule by name."""
-        for rule in self.rules:
-            if rule.name == rule_name:
-                return rule
-        return None
+        return self._by_name.get(rule_name)
     
     def list_rules(self, enabled_only: bool = False) -> List[EmailRule]:
         """
@@ -166,49 +310,137 @@ class EmailRuleEngine:
             return [rule for rule in self.rules if rule.enabled]
         return self.rules.copy()
     
-    def evaluate_email(self, email_data: EmailData) -> List[EmailRule]:
+    def get_active_rules(self) -> List[Tuple[EmailRule, rule_engine.Rule]]:
+        """
+        Get the enabled rules paired with their compiled conditions.
+        
+        The result can be computed once and passed to evaluate_email for
+        every email in a batch.
+        
+        Returns:
+            List of (EmailRule, compiled rule) tuples, sorted by priority (highest first)
+        """
+        active_rules = []
+        compiled_rules = self._compiled_rules
+        
+        for rule, key in zip(self._sorted_rules, self._sort_keys):
+            # Priorities are normally fixed once a rule is added; re-sort and
+            # start over if one was changed in place since
+            if rule.priority != -key:
+                self._rebuild_sorted()
+                return self.get_active_rules()
+            if not rule.enabled:
+                continue
+            compiled_rule = compiled_rules.get(rule.name)
+            if compiled_rule is None:
+                # Re-compile if needed
+                try:
+                    compiled_rule = self.compile_condition(rule.condition)
+                except Exception as e:
+                    logger.error(f"Error compiling rule '{rule.name}': {e}")
+                    continue
+                self._compiled_rules[rule.name] = compiled_rule
+            active_rules.append((rule, compiled_rule))
+        
+        return active_rules
+    
+    def evaluate_email(self, email_data: EmailData,
+                       active_rules: Optional[List[Tuple[EmailRule, rule_engine.Rule]]] = None,
+                       email_dict: Optional[Dict[str, Any]] = None,
+                       changed_fields: Optional[AbstractSet[str]] = None) -> List[EmailRule]:
         """
         Evaluate all rules against an email and return matching rules.
         
         Args:
             email_data: EmailData object to evaluate
+            active_rules: Precomputed result of get_active_rules (optional)
+            email_dict: Precomputed email_data.to_dict() (optional, not modified)
+            changed_fields: Fields (email_data.to_dict() keys) modified since
+                the email was last evaluated, e.g. after header enrichment.
+                With memoize enabled, only rules reading one of them are
+                re-evaluated; the rest reuse their memoized result.
             
         Returns:
             List of matching EmailRule objects, sorted by priority (highest first)
         """
-        matching_rules = []
-        email_dict = email_data.to_dict()
+        return list(self._iter_matching_rules(email_data, active_rules, email_dict, changed_fields))
+    
+    def evaluate_batch(self, emails: List[EmailData]) -> List[List[EmailRule]]:
+        """
+        Evaluate all rules against several emails.
         
-        # Add custom functions to the context for more complex evaluations
-        context = self._create_evaluation_context(email_data)
-        email_dict.update(context)
+        The active rules are resolved once for the whole batch.
         
-        # Sort rules by priority (highest first)
-        sorted_rules = sorted(
-            [rule for rule in self.rules if rule.enabled],
-            key=lambda r: r.priority,
-            reverse=True
-        )
+        Args:
+            emails: EmailData objects to evaluate
+            
+        Returns:
+            One list of matching EmailRule objects per email, in input order
+        """
+        active_rules = self.get_active_rules()
+        return [self.evaluate_email(email_data, active_rules) for email_data in emails]
+    
+    def _iter_matching_rules(self, email_data: EmailData,
+                             active_rules: Optional[List[Tuple[EmailRule, rule_engine.Rule]]] = None,
+                             email_dict: Optional[Dict[str, Any]] = None,
+                             changed_fields: Optional[AbstractSet[str]] = None) -> Iterator[EmailRule]:
+        """Lazily yield the rules matching an email, highest priority first."""
+        if active_rules is None:
+            active_rules = self.get_active_rules()
         
-        for rule in sorted_rules:
-            try:
-                compiled_rule = self._compiled_rules.get(rule.name)
-                if compiled_rule is None:
-                    # Re-compile if needed
-                    compiled_rule = rule_engine.Rule(rule.condition)
-                    self._compiled_rules[rule.name] = compiled_rule
-                
-                if compiled_rule.matches(email_dict):
-                    matching_rules.append(rule)
-                    logger.debug(f"Rule '{rule.name}' matched email: {email_data.subject[:50]}")
-                else:
-                    logger.debug(f"Rule '{rule.name}' did not match email: {email_data.subject[:50]}")
-                    
-            except Exception as e:
-                logger.error(f"Error evaluating rule '{rule.name}': {e}")
-                continue
+        # Nothing to evaluate, so skip building the evaluation dict
+        if not active_rules:
+            return
+        
+        memo = self._memo if email_data.message_id else None
+        evaluation_dict = None
+        # Rules with identical conditions share one compiled rule (see
+        # _compile_condition), so each distinct condition is matched once
+        condition_results: Dict[int, bool] = {}
         
-        return matching_rules
+        for rule, compiled_rule in active_rules:
+            if memo is not None:
+                key = (rule.name, email_data.message_id)
+                matched = memo.get(key)
+                if matched is not None and changed_fields and self._reads_changed_fields(compiled_rule, changed_fields):
+                    matched = None
+                if matched is not None:
+                    memo.move_to_end(key)
+                    if matched:
+                        yield rule
+                    continue
+            
+            if evaluation_dict is None:
+                evaluation_dict = dict(email_dict) if email_dict is not None else email_data.to_dict()
+                # Add custom functions to the context for more complex evaluations
+                evaluation_dict.update(self._create_evaluation_context(email_data))
+            
+            matched = condition_results.get(id(compiled_rule))
+            if matched is None:
+                try:
+                    matched = compiled_rule.matches(evaluation_dict)
+                except Exception as e:
+                    logger.error(f"Error evaluating rule '{rule.name}': {e}")
+                    continue
+                condition_results[id(compiled_rule)] = matched
+            
+            if memo is not None:
+                memo[key] = matched
+                if len(memo) > self._memo_size:
+                    memo.popitem(last=False)
+            
+            if matched:
+                logger.debug(f"Rule '{rule.name}' matched email: {email_data.subject[:50]}")
+                yield rule
+            else:
+                logger.debug(f"Rule '{rule.name}' did not match email: {email_data.subject[:50]}")
+    
+    @staticmethod
+    def _reads_changed_fields(compiled_rule: rule_engine.Rule, changed_fields: AbstractSet[str]) -> bool:
+        """Whether a rule's condition depends on any of the changed fields."""
+        # rule-engine records every symbol a condition references while parsing
+        symbols = compiled_rule.context.symbols
+        return not symbols.isdisjoint(changed_fields) or not symbols.isdisjoint(_EMAIL_BOUND_SYMBOLS)
     
     def get_first_matching_action(self, email_data: EmailData) -> Optional[str]:
         """
@@ -220,9 +452,10 @@ class EmailRuleEngine:
         Returns:
             Action string from the first matching rule, or None if no matches
         """
-        matching_rules = self.evaluate_email(email_data)
-        if matching_rules:
-            return matching_rules[0].action
+        # Rules are already in priority order, so stop at the first match
+        first_match = next(self._iter_matching_rules(email_data), None)
+        if first_match is not None:
+            return first_match.action
         return None
     
     def get_all_matching_actions(self, email_data: EmailData) -> List[str]:
@@ -235,8 +468,7 @@ class EmailRuleEngine:
         Returns:
             List of action strings from all matching rules
         """
-        matching_rules = self.evaluate_email(email_data)
-        return [rule.action for rule in matching_rules]
+        return [rule.action for rule in self._iter_matching_rules(email_data)]
     
     def _create_evaluation_context(self, email_data: EmailData) -> Dict[str, Any]:
         """
@@ -248,25 +480,42 @@ class EmailRuleEngine:
         Returns:
             Dictionary of context functions and values
         """
-        return {
-            # Helper functions
-            'contains': lambda text, keyword: keyword.lower() in text.lower(),
-            'starts_with': lambda text, prefix: text.lower().startswith(prefix.lower()),
-            'ends_with': lambda text, suffix: text.lower().endswith(suffix.lower()),
-            'matches_pattern': lambda text, pattern: email_data.matches_sender_pattern(pattern) if text == email_data.sender else False,
-            'has_keyword': lambda keyword: email_data.contains_keyword(keyword),
-            'has_attachment_type': lambda content_type: email_data.has_attachment_type(content_type),
+        domain = email_data.sender_domain
+        hour = email_data.received_date.hour
+        
+        context = _CONTEXT_TEMPLATE.copy()
+        context.update(
+            # Helper functions bound to this email
+            matches_pattern=lambda text, pattern: email_data.matches_sender_pattern(pattern) if text == email_data.sender else False,
+            has_keyword=email_data.contains_keyword,
+            has_attachment_type=email_data.has_attachment_type,
             
             # Common email domains for rules
-            'is_gmail': email_data.sender_domain == 'gmail.com' if email_data.sender_domain else False,
-            'is_outlook': email_data.sender_domain in ['outlook.com', 'hotmail.com', 'live.com'] if email_data.sender_domain else False,
-            'is_internal': email_data.sender_domain in ['company.com', 'internal.org'] if email_data.sender_domain else False,  # Configure as needed
+            is_gmail=domain == 'gmail.com',
+            is_outlook=domain in ('outlook.com', 'hotmail.com', 'live.com'),
+            is_internal=domain in ('company.com', 'internal.org'),  # Configure as needed
             
             # Time-based helpers
-            'is_weekend': email_data.received_date.weekday() >= 5,
-            'is_business_hours': 9 <= email_data.received_date.hour <= 17,
-            'is_after_hours': email_data.received_date.hour < 9 or email_data.received_date.hour > 17,
-        }
+            is_weekend=email_data.received_date.weekday() >= 5,
+            is_business_hours=9 <= hour <= 17,
+            is_after_hours=hour < 9 or hour > 17,
+        )
+        return context
+    
+    def compile_condition(self, condition: str) -> rule_engine.Rule:
+        """
+        Compile a rule condition for repeated evaluation.
+        
+        Args:
+            condition: Rule condition string to compile
+            
+        Returns:
+            Compiled rule that can be passed to test_rule
+            
+        Raises:
+            rule_engine.RuleSyntaxError: If the condition is invalid
+        """
+        return _compile_condition(condition)
     
     def validate_rule_syntax(self, condition: str) -> bool:
         """
@@ -278,25 +527,25 @@ class EmailRuleEngine:
         Returns:
             True if syntax is valid, False otherwise
         """
-        try:
-            rule_engine.Rule(condition)
-            return True
-        except rule_engine.RuleSyntaxError:
-            return False
+        return _is_valid_condition(condition)
     
-    def test_rule(self, condition: str, email_data: EmailData) -> bool:
+    def test_rule(self, condition: Union[str, rule_engine.Rule], email_data: EmailData) -> bool:
         """
         Test a rule condition against email data without adding it to the engine.
         
         Args:
-            condition: Rule condition to test
+            condition: Rule condition to test, as a string or as returned by
+                compile_condition (to test many emails without recompiling)
             email_data: EmailData to test against
             
         Returns:
             True if rule matches, False otherwise
         """
         try:
-            test_rule = rule_engine.Rule(condition)
+            if isinstance(condition, rule_engine.Rule):
+                test_rule = condition
+            else:
+                test_rule = self.compile_condition(condition)
             email_dict = email_data.to_dict()
             context = self._create_evaluation_context(email_data)
             email_dict.update(context)
@@ -308,7 +557,11 @@ class EmailRuleEngine:
     def clear_rules(self) -> None:
         """Remove all rules from the engine."""
         self.rules.clear()
+        self._by_name.clear()
         self._compiled_rules.clear()
+        self._sorted_rules.clear()
+        self._sort_keys.clear()
+        self._clear_memo()
         logger.info("Cleared all rules from engine")
     
     def export_rules(self) -> List[Dict[str, Any]]:
@@ -332,4 +585,26 @@ class EmailRuleEngine:
                 self.add_rule(rule)
             except Exception as e:
                 logger.error(f"Failed to import rule '{rule_dict.get('name', 'unknown')}': {e}")
-                continue
\ No newline at end of file
+                continue
+    
+    def export_json(self, indent: Optional[int] = None) -> str:
+        """
+        Export all rules as a JSON array (encoded with orjson when available).
+        
+        Args:
+            indent: Pretty-print with a 2-space indent (None or 2)
+            
+        Returns:
+            JSON string of the export_rules() dictionaries
+        """
+        return json_utils.dumps(self.export_rules(), indent=indent)
+    
+    def import_json(self, data: Union[str, bytes], clear_existing: bool = False) -> None:
+        """
+        Import rules from a JSON array as produced by export_json.
+        
+        Args:
+            data: JSON text as string or bytes
+            clear_existing: Whether to clear existing rules first
+        """
+        self.import_rules(json_utils.loads(data), clear_existing=clear_existing)
@@ -1,18 +1,29 @@
 """
 SQS client for routing emails to different queues based on rule evaluation.
 """
-import json
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
-from ..models.email_model import EmailData
+from ..models.email_model import EmailData, _slotted
+from .. import json_utils
 
 logger = logging.getLogger(__name__)
 
+# botocore defaults to 10 pooled connections; parallel routing exhausts that
+# and blocks waiting for a free connection. Adaptive retries back off on
+# throttling, and keepalive stops idle pooled connections being dropped.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True
+)
 
+
+@_slotted
 @dataclass
 class SQSQueue:
     """Represents an SQS queue configuration."""
@@ -59,7 +70,8 @@ class SQSClient:
     """
     
     def __init__(self, region_name: str = 'us-east-1', aws_access_key_id: Optional[str] = None,
-                 aws_secret_access_key: Optional[str] = None, aws_session_token: Optional[str] = None):
+                 aws_secret_access_key: Optional[str] = None, aws_session_token: Optional[str] = None,
+                 sqs_client: Optional[Any] = None):
         """
         Initialize SQS client.
         
@@ -68,10 +80,16 @@ class SQSClient:
             aws_access_key_id: AWS access key (optional, can use IAM roles)
             aws_secret_access_key: AWS secret key (optional, can use IAM roles)
             aws_session_token: AWS session token (optional)
+            sqs_client: Existing boto3 SQS client to reuse (and share its
+                connection pool) instead of creating a new one
         """
         self.region_name = region_name
         self.queues: Dict[str, SQSQueue] = {}
         
+        if sqs_client is not None:
+            self.sqs = sqs_client
+            return
+        
         try:
             # Initialize boto3 SQS client
             session_kwargs = {'region_name': region_name}
@@ -83,7 +101,7 @@ class SQSClient:
                 if aws_session_token:
                     session_kwargs['aws_session_token'] = aws_session_token
             
-            self.sqs = boto3.client('sqs', **session_kwargs)
+            self.sqs = boto3.client('sqs', config=_CLIENT_CONFIG, **session_kwargs)
             logger.info(f"Initialized SQS client for region: {region_name}")
             
         except NoCredentialsError:
@@ -127,7 +145,8 @@ class SQSClient:
     def send_email_message(self, email_data: EmailData, queue_name: str, 
                           additional_attributes: Optional[Dict[str, Any]] = None,
                           message_group_id: Optional[str] = None,
-                          message_deduplication_id: Optional[str] = None) -> bool:
+                          message_deduplication_id: Optional[str] = None,
+                          email_dict: Optional[Dict[str, Any]] = None) -> bool:
         """
         Send an email message to the specified SQS queue.
         
@@ -137,6 +156,7 @@ class SQSClient:
             additional_attributes: Additional message attributes
             message_group_id: For FIFO queues
             message_deduplication_id: For FIFO queues
+            email_dict: Precomputed email_data.to_dict() (optional)
             
         Returns:
             True if message was sent successfully, False otherwise
@@ -148,7 +168,7 @@ class SQSClient:
         
         try:
             # Prepare message body
-            message_body = self._prepare_message_body(email_data, additional_attributes)
+            message_body = self._prepare_message_body(email_data, additional_attributes, email_dict)
             
             # Prepare message attributes
             message_attributes = self._prepare_message_attributes(email_data)
@@ -156,7 +176,7 @@ class SQSClient:
             # Send message parameters
             send_params = {
                 'QueueUrl': queue.url,
-                'MessageBody': json.dumps(message_body),
+                'MessageBody': json_utils.dumps(message_body),
                 'MessageAttributes': message_attributes
             }
             
@@ -182,12 +202,16 @@ class SQSClient:
             logger.error(f"Unexpected error sending message to queue '{queue_name}': {e}")
             return False
     
-    def send_batch_messages(self, messages: List[tuple], queue_name: str) -> Dict[str, Any]:
+    def send_batch_messages(self, messages: List[Union[tuple, Dict[str, Any]]], queue_name: str) -> Dict[str, Any]:
         """
         Send multiple messages to a queue in a single batch.
         
+        Messages are sent in chunks of 10, the SQS batch limit.
+        
         Args:
-            messages: List of tuples (email_data, additional_attributes, message_group_id, deduplication_id)
+            messages: List of tuples (email_data, additional_attributes, message_group_id, deduplication_id),
+                or of prebuilt send_message_batch entries (dicts with 'MessageBody' and optionally
+                'Id', 'MessageAttributes', ...) which are sent as-is
             queue_name: Name of the queue to send to
             
         Returns:
@@ -208,28 +232,7 @@ class SQSClient:
             batch = messages[i:i + batch_size]
             
             try:
-                entries = []
-                for idx, message_data in enumerate(batch):
-                    email_data = message_data[0]
-                    additional_attributes = message_data[1] if len(message_data) > 1 else None
-                    message_group_id = message_data[2] if len(message_data) > 2 else None
-                    deduplication_id = message_data[3] if len(message_data) > 3 else None
-                    
-                    message_body = self._prepare_message_body(email_data, additional_attributes)
-                    message_attributes = self._prepare_message_attributes(email_data)
-                    
-                    entry = {
-                        'Id': str(idx),
-                        'MessageBody': json.dumps(message_body),
-                        'MessageAttributes': message_attributes
-                    }
-                    
-                    if message_group_id:
-                        entry['MessageGroupId'] = message_group_id
-                    if deduplication_id:
-                        entry['MessageDeduplicationId'] = deduplication_id
-                    
-                    entries.append(entry)
+                entries = [self._prepare_batch_entry(idx, message_data) for idx, message_data in enumerate(batch)]
                 
                 # Send batch
                 response = self.sqs.send_message_batch(QueueUrl=queue.url, Entries=entries)
@@ -256,19 +259,49 @@ class SQSClient:
             'errors': errors
         }
     
-    def _prepare_message_body(self, email_data: EmailData, additional_attributes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _prepare_batch_entry(self, idx: int, message_data: Union[tuple, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build one send_message_batch entry from a message tuple or a prebuilt entry."""
+        if isinstance(message_data, dict):
+            if 'Id' in message_data:
+                return message_data
+            return {'Id': str(idx), **message_data}
+        
+        email_data = message_data[0]
+        additional_attributes = message_data[1] if len(message_data) > 1 else None
+        message_group_id = message_data[2] if len(message_data) > 2 else None
+        deduplication_id = message_data[3] if len(message_data) > 3 else None
+        
+        message_body = self._prepare_message_body(email_data, additional_attributes)
+        message_attributes = self._prepare_message_attributes(email_data)
+        
+        entry = {
+            'Id': str(idx),
+            'MessageBody': json_utils.dumps(message_body),
+            'MessageAttributes': message_attributes
+        }
+        
+        if message_group_id:
+            entry['MessageGroupId'] = message_group_id
+        if deduplication_id:
+            entry['MessageDeduplicationId'] = deduplication_id
+        
+        return entry
+    
+    def _prepare_message_body(self, email_data: EmailData, additional_attributes: Optional[Dict[str, Any]] = None,
+                              email_dict: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Prepare the message body for SQS.
         
         Args:
             email_data: EmailData object
             additional_attributes: Additional attributes to include
+            email_dict: Precomputed email_data.to_dict() (optional)
             
         Returns:
             Dictionary containing the message data
         """
         message_body = {
-            'email_data': email_data.to_dict(),
+            'email_data': email_dict if email_dict is not None else email_data.to_dict(),
             'timestamp': email_data.received_date.isoformat(),
             'message_type': 'email_routing'
         }
@@ -288,7 +321,8 @@ class SQSClient:
         Returns:
             Dictionary of message attributes
         """
-        attributes = {
+        attachment_count = len(email_data.attachments)
+        return {
             'sender': {
                 'DataType': 'String',
                 'StringValue': email_data.sender
@@ -303,26 +337,22 @@ class SQSClient:
             },
             'has_attachments': {
                 'DataType': 'String',
-                'StringValue': str(len(email_data.attachments) > 0)
+                'StringValue': str(attachment_count > 0)
             },
             'attachment_count': {
                 'DataType': 'Number',
-                'StringValue': str(len(email_data.attachments))
+                'StringValue': str(attachment_count)
             },
             'recipient_count': {
                 'DataType': 'Number',
                 'StringValue': str(len(email_data.recipients))
+            },
+            # Truncated; slicing a shorter string returns it unchanged
+            'subject': {
+                'DataType': 'String',
+                'StringValue': email_data.subject[:256]
             }
         }
-        
-        # Add subject (truncated if too long)
-        subject = email_data.subject[:256] if len(email_data.subject) > 256 else email_data.subject
-        attributes['subject'] = {
-            'DataType': 'String',
-            'StringValue': subject
-        }
-        
-        return attributes
     
     def test_queue_connection(self, queue_name: str) -> bool:
         """
@@ -9,6 +9,13 @@ from typing import Dict, List, Any, Optional, Union
 
 from ..rules.rule_engine import EmailRule
 from ..sqs.sqs_client import SQSQueue
+from .. import json_utils
+
+# Use the LibYAML-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +27,40 @@ class ConfigLoader:
     Supports loading from JSON and YAML files.
     """
     
+    @staticmethod
+    def loads(text: str, fmt: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse configuration from a string.
+        
+        Args:
+            text: Configuration text
+            fmt: Text format ('yaml' or 'json'); detected from the content if None
+            
+        Returns:
+            Dictionary containing the configuration
+        """
+        if fmt is None:
+            try:
+                return json_utils.loads(text)
+            except json.JSONDecodeError:
+                return yaml.load(text, Loader=_YamlLoader)
+        
+        fmt = fmt.lower()
+        if fmt == 'json':
+            return json_utils.loads(text)
+        elif fmt in ['yaml', 'yml']:
+            return yaml.load(text, Loader=_YamlLoader)
+        
+        raise ValueError(f"Unsupported configuration format: {fmt}")
+    
     @staticmethod
     def load_file(file_path: Union[str, Path]) -> Dict[str, Any]:
         """
         Load configuration from a file.
         
+        The format is taken from the file suffix and detected from the
+        content for unknown suffixes.
+        
         Args:
             file_path: Path to the configuration file
             
@@ -36,19 +72,12 @@ class ConfigLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {file_path}")
         
+        suffix = file_path.suffix.lower().lstrip('.')
+        fmt = suffix if suffix in ['yaml', 'yml', 'json'] else None
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                if file_path.suffix.lower() in ['.yaml', '.yml']:
-                    return yaml.safe_load(f)
-                elif file_path.suffix.lower() == '.json':
-                    return json.load(f)
-                else:
-                    # Try to detect format by content
-                    content = f.read()
-                    try:
-                        return json.loads(content)
-                    except json.JSONDecodeError:
-                        return yaml.safe_load(content)
+                return ConfigLoader.loads(f.read(), fmt)
                         
         except Exception as e:
             logger.error(f"Failed to load configuration from {file_path}: {e}")
@@ -69,9 +98,9 @@ class ConfigLoader:
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 if format.lower() == 'json':
-                    json.dump(data, f, indent=2, default=str)
+                    f.write(json_utils.dumps(data, indent=2))
                 else:
-                    yaml.dump(data, f, default_flow_style=False, indent=2)
+                    yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, indent=2)
                     
             logger.info(f"Configuration saved to {file_path}")
             
@@ -1,17 +1,27 @@
 """
 Email parsing utilities for converting various email formats to EmailData objects.
 """
-import email
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import os
 from email.message import EmailMessage
+from email.parser import BytesParser
+from email.policy import default as _POLICY
 from pathlib import Path
 from typing import Union, Optional, List
-import json
 
 from ..models.email_model import EmailData
+from .. import json_utils
 
 logger = logging.getLogger(__name__)
 
+# Parser objects hold no per-message state, so one instance serves every call
+_PARSER = BytesParser(policy=_POLICY)
+
+# Files handed to each batch-parse worker task
+_BATCH_CHUNK_SIZE = 16
+
 
 class EmailParser:
     """
@@ -30,10 +40,10 @@ class EmailParser:
             EmailData object
         """
         try:
-            if isinstance(raw_email, bytes):
-                raw_email = raw_email.decode('utf-8', errors='ignore')
+            if isinstance(raw_email, str):
+                raw_email = raw_email.encode('utf-8', errors='replace')
             
-            message = email.message_from_string(raw_email)
+            message = _PARSER.parsebytes(raw_email)
             return EmailData.from_email_message(message)
             
         except Exception as e:
@@ -57,29 +67,29 @@ class EmailParser:
             raise FileNotFoundError(f"Email file not found: {file_path}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                message = _PARSER.parse(f)
             
-            return EmailParser.from_raw_email(content)
+            return EmailData.from_email_message(message)
             
         except Exception as e:
             logger.error(f"Failed to parse email from file {file_path}: {e}")
             raise
     
     @staticmethod
-    def from_json(json_data: Union[str, dict]) -> EmailData:
+    def from_json(json_data: Union[str, bytes, dict]) -> EmailData:
         """
         Parse email from JSON data.
         
         Args:
-            json_data: JSON string or dictionary containing email data
+            json_data: JSON string, JSON bytes or dictionary containing email data
             
         Returns:
             EmailData object
         """
         try:
-            if isinstance(json_data, str):
-                data = json.loads(json_data)
+            if isinstance(json_data, (str, bytes)):
+                data = json_utils.loads(json_data)
             else:
                 data = json_data
             
@@ -91,13 +101,19 @@ class EmailParser:
     
     @staticmethod
     def batch_parse_directory(directory_path: Union[str, Path], 
-                            pattern: str = "*.eml") -> List[EmailData]:
+                            pattern: str = "*.eml",
+                            max_workers: Optional[int] = None) -> List[EmailData]:
         """
         Parse all email files in a directory.
         
+        Files are read and parsed on a thread pool; the result keeps the
+        order of the directory listing.
+        
         Args:
             directory_path: Path to directory containing email files
             pattern: File pattern to match (default: *.eml)
+            max_workers: Maximum number of parser threads (default:
+                min(32, cpu_count * 4))
             
         Returns:
             List of EmailData objects
@@ -110,23 +126,66 @@ class EmailParser:
         if not directory_path.is_dir():
             raise ValueError(f"Path is not a directory: {directory_path}")
         
-        emails = []
-        email_files = list(directory_path.glob(pattern))
+        email_files = EmailParser._list_email_files(directory_path, pattern)
         
         logger.info(f"Found {len(email_files)} email files in {directory_path}")
         
-        for email_file in email_files:
-            try:
-                email_data = EmailParser.from_file(email_file)
-                emails.append(email_data)
-                logger.debug(f"Successfully parsed: {email_file.name}")
-            except Exception as e:
-                logger.error(f"Failed to parse {email_file.name}: {e}")
-                continue
+        chunks = [email_files[i:i + _BATCH_CHUNK_SIZE]
+                  for i in range(0, len(email_files), _BATCH_CHUNK_SIZE)]
+        
+        if len(chunks) > 1:
+            if max_workers is None:
+                max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                parsed_chunks = list(executor.map(EmailParser._parse_files, chunks))
+        else:
+            parsed_chunks = [EmailParser._parse_files(chunk) for chunk in chunks]
+        
+        emails = [email_data for chunk in parsed_chunks
+                  for email_data in chunk if email_data is not None]
         
         logger.info(f"Successfully parsed {len(emails)} out of {len(email_files)} email files")
         return emails
     
+    @staticmethod
+    def _parse_files(email_files: List[Path]) -> List[Optional[EmailData]]:
+        """Parse a chunk of email files, with None for files that fail."""
+        return [EmailParser._safe_from_file(email_file) for email_file in email_files]
+    
+    @staticmethod
+    def _safe_from_file(email_file: Path) -> Optional[EmailData]:
+        """Parse an email file, logging and returning None on failure."""
+        try:
+            email_data = EmailParser.from_file(email_file)
+            logger.debug(f"Successfully parsed: {email_file.name}")
+            return email_data
+        except Exception as e:
+            logger.error(f"Failed to parse {email_file.name}: {e}")
+            return None
+    
+    @staticmethod
+    def _list_email_files(directory_path: Path, pattern: str) -> List[Path]:
+        """
+        List the files in a directory whose names match a pattern.
+        
+        Uses os.scandir so file type checks come from the directory entries
+        instead of a stat() per file. Patterns that reach into subdirectories
+        are handed to Path.glob.
+        """
+        if '/' in pattern or '**' in pattern:
+            return [path for path in directory_path.glob(pattern) if path.is_file()]
+        
+        # "*.eml"-style patterns only need a suffix check
+        suffix = pattern[1:]
+        if pattern.startswith('*') and not any(c in suffix for c in '*?['):
+            matches = lambda name: name.endswith(suffix)
+        else:
+            matches = lambda name: fnmatch.fnmatchcase(name, pattern)
+        
+        with os.scandir(directory_path) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.is_file() and matches(entry.name)]
+    
     @staticmethod
     def create_sample_email_data() -> EmailData:
         """
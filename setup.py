@@ -58,13 +58,20 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-mock>=3.10.0",
+            "pytest-xdist>=3.0.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "fast": [
+            "orjson>=3.8.0",
+        ],
         "test": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-mock>=3.10.0",
+            "pytest-xdist>=3.0.0",
         ],
     },
     entry_points={
@@ -0,0 +1,90 @@
+"""
+Shared pytest fixtures for the InboundOrchestrator test suite.
+"""
+import email
+import string
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Make the package importable without installing it; done once here rather
+# than in every test module
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from inbound_orchestrator.models.email_model import EmailData, EmailAttachment
+from inbound_orchestrator.sqs.sqs_client import SQSQueue
+
+
+# Raw email shared by the parsing tests; ``$extra`` carries the header(s)
+# a test varies (priority, Cc/Bcc, MIME type, ...).
+RAW_EMAIL_TEMPLATE = string.Template(
+    "From: sender@example.com\n"
+    "To: recipient@example.com\n"
+    "Subject: $subj\n"
+    "$extra\n"
+    "\n"
+    "$body\n"
+)
+
+
+@pytest.fixture(scope="module")
+def sample_attachment():
+    """PDF attachment shared by every test in a module (treat as read-only)."""
+    return EmailAttachment(
+        filename="test.pdf",
+        content_type="application/pdf",
+        size=1024,
+        content=b"sample content"
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_email(sample_attachment):
+    """EmailData built once per module; tests must not mutate it."""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return EmailData(
+        subject="Test Email",
+        sender="sender@example.com",
+        recipients=["recipient@example.com"],
+        cc_recipients=["cc@example.com"],
+        bcc_recipients=[],
+        body_text="Test email body",
+        body_html="<p>Test email body</p>",
+        message_id="<test@example.com>",
+        received_date=now,
+        sent_date=now,
+        headers={"From": "sender@example.com"},
+        attachments=[sample_attachment],
+        priority="normal"
+    )
+
+
+@pytest.fixture(scope="module")
+def parsed_email(request):
+    """EmailData parsed from ``RAW_EMAIL_TEMPLATE``.
+
+    The substitutions (``subj``, ``extra``, ``body``) are passed as a dict via
+    ``indirect`` parametrization; ``subj`` and ``body`` have defaults. Module
+    scope caches one parse per parameter, so several assertions (or tests)
+    can share it without re-parsing.
+    """
+    fields = {"subj": "Test", "body": "Body"}
+    fields.update(request.param)
+    raw = RAW_EMAIL_TEMPLATE.substitute(fields)
+    return EmailData.from_email_message(email.message_from_string(raw))
+
+
+@pytest.fixture
+def make_queue():
+    """Factory for numbered test queues: ``make_queue(1)`` -> ``queue1``."""
+    def _make_queue(i):
+        return SQSQueue(
+            name=f"queue{i}",
+            url=f"https://test.com/queue{i}",
+            description="Test"
+        )
+    return _make_queue
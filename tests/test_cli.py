@@ -2,24 +2,20 @@
 """
 Tests for the CLI module.
 """
-import unittest
-import sys
-from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch, call
 from io import StringIO
 import argparse
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from inbound_orchestrator import cli
 from inbound_orchestrator.models.email_model import EmailData
 
 
-class TestCLI(unittest.TestCase):
+class TestCLI:
     """Test cases for CLI module."""
     
-    def setUp(self):
+    def setup_method(self):
         """Set up test fixtures."""
         self.sample_email = EmailData(
             subject="Test Email",
@@ -81,18 +77,18 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 0)
+        assert result == 0
         mock_intake.fetch_emails_by_email_id.assert_called_once_with(33)
         mock_orchestrator.process_emails_batch.assert_called_once()
         
         output = mock_stdout.getvalue()
-        self.assertIn('Connected to database:', output)
-        self.assertIn('Fetched 1 email for email_id=33', output)
-        self.assertIn('Processed 1 email:', output)
-        self.assertIn('Successful: 1', output)
-        self.assertIn('Queue Distribution:', output)
-        self.assertIn('test_queue: 1', output)
-        self.assertIn('DRY RUN', output)
+        assert 'Connected to database:' in output
+        assert 'Fetched 1 email for email_id=33' in output
+        assert 'Processed 1 email:' in output
+        assert 'Successful: 1' in output
+        assert 'Queue Distribution:' in output
+        assert 'test_queue: 1' in output
+        assert 'DRY RUN' in output
     
     @patch('inbound_orchestrator.cli.PostgresEmailIntake')
     @patch('inbound_orchestrator.cli.InboundOrchestrator')
@@ -146,16 +142,16 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 0)
+        assert result == 0
         mock_intake.fetch_all_emails.assert_called_once_with(limit=10)
         mock_orchestrator.process_emails_batch.assert_called_once()
         
         output = mock_stdout.getvalue()
-        self.assertIn('Fetched 2 emails from database (limit=10)', output)
-        self.assertIn('Processed 2 emails:', output)
-        self.assertIn('Successful: 1', output)
-        self.assertIn('Failed: 1', output)
-        self.assertIn('Success Rate: 50.0%', output)
+        assert 'Fetched 2 emails from database (limit=10)' in output
+        assert 'Processed 2 emails:' in output
+        assert 'Successful: 1' in output
+        assert 'Failed: 1' in output
+        assert 'Success Rate: 50.0%' in output
     
     @patch('inbound_orchestrator.cli.PostgresEmailIntake')
     @patch('inbound_orchestrator.cli.InboundOrchestrator')
@@ -192,12 +188,12 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 1)
+        assert result == 1
         mock_intake.fetch_emails_by_email_id.assert_called_once_with(999)
         mock_orchestrator.process_emails_batch.assert_not_called()
         
         output = mock_stdout.getvalue()
-        self.assertIn('No emails found matching criteria', output)
+        assert 'No emails found matching criteria' in output
     
     @patch('inbound_orchestrator.cli.PostgresEmailIntake')
     @patch('inbound_orchestrator.cli.InboundOrchestrator')
@@ -233,11 +229,11 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 1)
+        assert result == 1
         mock_intake.fetch_emails_by_email_id.assert_not_called()
         
         output = mock_stdout.getvalue()
-        self.assertIn('Failed to connect to database', output)
+        assert 'Failed to connect to database' in output
     
     @patch('inbound_orchestrator.cli.PostgresEmailIntake')
     @patch('sys.stdout', new_callable=StringIO)
@@ -266,11 +262,11 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 1)
+        assert result == 1
         
         output = mock_stdout.getvalue()
-        self.assertIn('PostgreSQL support not available', output)
-        self.assertIn('pip install psycopg2-binary', output)
+        assert 'PostgreSQL support not available' in output
+        assert 'pip install psycopg2-binary' in output
     
     @patch.dict('os.environ', {'POSTGRES_PORT': 'invalid'})
     @patch('sys.stdout', new_callable=StringIO)
@@ -296,10 +292,10 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 1)
+        assert result == 1
         
         output = mock_stdout.getvalue()
-        self.assertIn('Invalid port value in POSTGRES_PORT environment variable', output)
+        assert 'Invalid port value in POSTGRES_PORT environment variable' in output
     
     @patch('inbound_orchestrator.cli.PostgresEmailIntake')
     @patch('inbound_orchestrator.cli.InboundOrchestrator')
@@ -353,13 +349,13 @@ class TestCLI(unittest.TestCase):
         result = cli.process_db_emails(args)
         
         # Verify
-        self.assertEqual(result, 0)
+        assert result == 0
         
         output = mock_stdout.getvalue()
-        self.assertIn('Rule Matches:', output)
-        self.assertIn('high_priority: 2', output)
-        self.assertIn('urgent: 1', output)
+        assert 'Rule Matches:' in output
+        assert 'high_priority: 2' in output
+        assert 'urgent: 1' in output
 
 
 if __name__ == '__main__':
-    unittest.main()
+    pytest.main([__file__])
@@ -2,21 +2,18 @@
 """
 Tests for the ConfigLoader class.
 """
-import unittest
-import sys
 from pathlib import Path
 import tempfile
 import json
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from inbound_orchestrator.utils.config_loader import ConfigLoader
 from inbound_orchestrator.rules.rule_engine import EmailRule
 from inbound_orchestrator.sqs.sqs_client import SQSQueue
 
 
-class TestConfigLoader(unittest.TestCase):
+class TestConfigLoader:
     """Test cases for ConfigLoader class."""
     
     def test_load_yaml_file(self):
@@ -33,9 +30,9 @@ list:
         
         try:
             config = ConfigLoader.load_file(config_path)
-            self.assertEqual(config['test_key'], 'test_value')
-            self.assertEqual(config['number'], 42)
-            self.assertEqual(len(config['list']), 2)
+            assert config['test_key'] == 'test_value'
+            assert config['number'] == 42
+            assert len(config['list']) == 2
         finally:
             Path(config_path).unlink()
     
@@ -47,14 +44,14 @@ list:
         
         try:
             config = ConfigLoader.load_file(config_path)
-            self.assertEqual(config['test_key'], 'test_value')
-            self.assertEqual(config['number'], 42)
+            assert config['test_key'] == 'test_value'
+            assert config['number'] == 42
         finally:
             Path(config_path).unlink()
     
     def test_load_file_not_found(self):
         """Test loading non-existent file."""
-        with self.assertRaises(FileNotFoundError):
+        with pytest.raises(FileNotFoundError):
             ConfigLoader.load_file('/nonexistent/path/to/file.yaml')
     
     def test_save_yaml_file(self):
@@ -68,8 +65,8 @@ list:
             
             # Load it back to verify
             loaded = ConfigLoader.load_file(config_path)
-            self.assertEqual(loaded['test_key'], 'test_value')
-            self.assertEqual(loaded['number'], 42)
+            assert loaded['test_key'] == 'test_value'
+            assert loaded['number'] == 42
         finally:
             Path(config_path).unlink()
     
@@ -84,8 +81,8 @@ list:
             
             # Load it back to verify
             loaded = ConfigLoader.load_file(config_path)
-            self.assertEqual(loaded['test_key'], 'test_value')
-            self.assertEqual(loaded['number'], 42)
+            assert loaded['test_key'] == 'test_value'
+            assert loaded['number'] == 42
         finally:
             Path(config_path).unlink()
     
@@ -105,9 +102,9 @@ rules:
         
         try:
             rules = ConfigLoader.load_rules(config_path)
-            self.assertEqual(len(rules), 1)
-            self.assertEqual(rules[0].name, 'test_rule')
-            self.assertEqual(rules[0].action, 'test_queue')
+            assert len(rules) == 1
+            assert rules[0].name == 'test_rule'
+            assert rules[0].action == 'test_queue'
         finally:
             Path(config_path).unlink()
     
@@ -131,8 +128,8 @@ rules:
         try:
             rules = ConfigLoader.load_rules(config_path)
             # Should load only the valid rule
-            self.assertEqual(len(rules), 1)
-            self.assertEqual(rules[0].name, 'valid_rule')
+            assert len(rules) == 1
+            assert rules[0].name == 'valid_rule'
         finally:
             Path(config_path).unlink()
     
@@ -165,9 +162,9 @@ rules:
             
             # Load it back to verify
             loaded_rules = ConfigLoader.load_rules(config_path)
-            self.assertEqual(len(loaded_rules), 2)
-            self.assertEqual(loaded_rules[0].name, 'rule1')
-            self.assertEqual(loaded_rules[1].name, 'rule2')
+            assert len(loaded_rules) == 2
+            assert loaded_rules[0].name == 'rule1'
+            assert loaded_rules[1].name == 'rule2'
         finally:
             Path(config_path).unlink()
     
@@ -184,8 +181,8 @@ queues:
         
         try:
             queues = ConfigLoader.load_queues(config_path)
-            self.assertEqual(len(queues), 1)
-            self.assertEqual(queues[0].name, 'test_queue')
+            assert len(queues) == 1
+            assert queues[0].name == 'test_queue'
         finally:
             Path(config_path).unlink()
     
@@ -212,9 +209,9 @@ queues:
             
             # Load it back to verify
             loaded_queues = ConfigLoader.load_queues(config_path)
-            self.assertEqual(len(loaded_queues), 2)
-            self.assertEqual(loaded_queues[0].name, 'queue1')
-            self.assertEqual(loaded_queues[1].name, 'queue2')
+            assert len(loaded_queues) == 2
+            assert loaded_queues[0].name == 'queue1'
+            assert loaded_queues[1].name == 'queue2'
         finally:
             Path(config_path).unlink()
     
@@ -249,15 +246,15 @@ logging_config:
         try:
             config = ConfigLoader.load_full_config(config_path)
             
-            self.assertIn('rules', config)
-            self.assertIn('queues', config)
-            self.assertIn('settings', config)
-            self.assertIn('aws_config', config)
-            self.assertIn('logging_config', config)
+            assert 'rules' in config
+            assert 'queues' in config
+            assert 'settings' in config
+            assert 'aws_config' in config
+            assert 'logging_config' in config
             
-            self.assertEqual(len(config['rules']), 1)
-            self.assertEqual(len(config['queues']), 1)
-            self.assertEqual(config['settings']['default_queue'], 'default')
+            assert len(config['rules']) == 1
+            assert len(config['queues']) == 1
+            assert config['settings']['default_queue'] == 'default'
         finally:
             Path(config_path).unlink()
     
@@ -272,14 +269,14 @@ logging_config:
             # Load it to verify
             config = ConfigLoader.load_file(config_path)
             
-            self.assertIn('settings', config)
-            self.assertIn('queues', config)
-            self.assertIn('rules', config)
-            self.assertGreater(len(config['queues']), 0)
-            self.assertGreater(len(config['rules']), 0)
+            assert 'settings' in config
+            assert 'queues' in config
+            assert 'rules' in config
+            assert len(config['queues']) > 0
+            assert len(config['rules']) > 0
         finally:
             Path(config_path).unlink()
 
 
 if __name__ == '__main__':
-    unittest.main()
+    pytest.main([__file__])
@@ -2,67 +2,63 @@
 """
 Tests for the EmailData model.
 """
-import unittest
-import sys
-from pathlib import Path
+import pickle
 from datetime import datetime
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from inbound_orchestrator.models.email_model import EmailData, EmailAttachment
 
 
-class TestEmailData(unittest.TestCase):
+# Fixed timestamp for emails whose dates the tests don't inspect.
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+SIMPLE_EMAIL = {
+    "subj": "Test Subject",
+    "extra": "Date: Mon, 1 Jan 2024 12:00:00 +0000",
+    "body": "Test body content",
+}
+
+CC_BCC_EMAIL = {
+    "subj": "Test with CC/BCC",
+    "extra": "Cc: cc@example.com\nBcc: bcc@example.com",
+}
+
+
+class TestEmailData:
     """Test cases for EmailData class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.sample_attachment = EmailAttachment(
-            filename="test.pdf",
-            content_type="application/pdf",
-            size=1024,
-            content=b"sample content"
-        )
-        
-        self.sample_email = EmailData(
-            subject="Test Email",
-            sender="sender@example.com",
-            recipients=["recipient@example.com"],
-            cc_recipients=["cc@example.com"],
-            bcc_recipients=[],
-            body_text="Test email body",
-            body_html="<p>Test email body</p>",
-            message_id="<test@example.com>",
-            received_date=datetime.now(),
-            sent_date=datetime.now(),
-            headers={"From": "sender@example.com"},
-            attachments=[self.sample_attachment],
-            priority="normal"
-        )
-    
-    def test_email_data_creation(self):
+    def test_email_data_creation(self, sample_email):
         """Test basic EmailData creation."""
-        self.assertEqual(self.sample_email.subject, "Test Email")
-        self.assertEqual(self.sample_email.sender, "sender@example.com")
-        self.assertEqual(self.sample_email.sender_domain, "example.com")
-        self.assertEqual(len(self.sample_email.attachments), 1)
+        assert sample_email.subject == "Test Email"
+        assert sample_email.sender == "sender@example.com"
+        assert sample_email.sender_domain == "example.com"
+        assert len(sample_email.attachments) == 1
     
-    def test_to_dict_conversion(self):
+    def test_to_dict_conversion(self, sample_email):
         """Test conversion to dictionary."""
-        email_dict = self.sample_email.to_dict()
+        email_dict = sample_email.to_dict()
         
         # Check basic fields
-        self.assertEqual(email_dict['subject'], "Test Email")
-        self.assertEqual(email_dict['sender'], "sender@example.com")
-        self.assertEqual(email_dict['sender_domain'], "example.com")
+        assert email_dict['subject'] == "Test Email"
+        assert email_dict['sender'] == "sender@example.com"
+        assert email_dict['sender_domain'] == "example.com"
         
         # Check computed fields
-        self.assertEqual(email_dict['recipient_count'], 1)
-        self.assertEqual(email_dict['cc_count'], 1)
-        self.assertEqual(email_dict['has_attachments'], True)
-        self.assertEqual(email_dict['attachment_count'], 1)
-        self.assertEqual(email_dict['subject_length'], len("Test Email"))
+        assert email_dict['recipient_count'] == 1
+        assert email_dict['cc_count'] == 1
+        assert email_dict['has_attachments'] is True
+        assert email_dict['attachment_count'] == 1
+        assert email_dict['subject_length'] == len("Test Email")
+    
+    def test_slots(self, sample_email):
+        """Test that instances use __slots__ and still pickle and compare."""
+        assert not hasattr(sample_email, '__dict__')
+        assert not hasattr(sample_email.attachments[0], '__dict__')
+        with pytest.raises(AttributeError):
+            sample_email.not_a_field = True
+        
+        assert pickle.loads(pickle.dumps(sample_email)) == sample_email
     
     def test_from_dict_creation(self):
         """Test creation from dictionary."""
@@ -75,7 +71,7 @@ class TestEmailData(unittest.TestCase):
             'body_text': 'Dict body',
             'body_html': None,
             'message_id': '<dict@example.com>',
-            'received_date': datetime.now().isoformat(),
+            'received_date': _NOW.isoformat(),
             'sent_date': None,
             'headers': {},
             'attachments': [],
@@ -83,33 +79,41 @@ class TestEmailData(unittest.TestCase):
         }
         
         email = EmailData.from_dict(email_dict)
-        self.assertEqual(email.subject, 'Dict Email')
-        self.assertEqual(email.sender, 'dict@example.com')
-        self.assertEqual(email.sender_domain, 'example.com')
-    
-    def test_contains_keyword(self):
+        assert email.subject == 'Dict Email'
+        assert email.sender == 'dict@example.com'
+        assert email.sender_domain == 'example.com'
+    
+    @pytest.mark.parametrize("keyword,expected", [
+        ("Test", True),
+        ("email", True),
+        ("nonexistent", False),
+        # Case insensitive
+        ("TEST", True),
+        ("EMAIL", True),
+    ])
+    def test_contains_keyword(self, sample_email, keyword, expected):
         """Test keyword searching functionality."""
-        self.assertTrue(self.sample_email.contains_keyword("Test"))
-        self.assertTrue(self.sample_email.contains_keyword("email"))
-        self.assertFalse(self.sample_email.contains_keyword("nonexistent"))
-        
-        # Test case insensitive
-        self.assertTrue(self.sample_email.contains_keyword("TEST"))
-        self.assertTrue(self.sample_email.contains_keyword("EMAIL"))
-    
-    def test_matches_sender_pattern(self):
+        assert sample_email.contains_keyword(keyword) is expected
+    
+    @pytest.mark.parametrize("pattern,expected", [
+        ("*@example.com", True),
+        ("sender@*", True),
+        ("*@other.com", False),
+    ])
+    def test_matches_sender_pattern(self, sample_email, pattern, expected):
         """Test sender pattern matching."""
-        self.assertTrue(self.sample_email.matches_sender_pattern("*@example.com"))
-        self.assertTrue(self.sample_email.matches_sender_pattern("sender@*"))
-        self.assertFalse(self.sample_email.matches_sender_pattern("*@other.com"))
+        assert sample_email.matches_sender_pattern(pattern) is expected
     
-    def test_has_attachment_type(self):
+    @pytest.mark.parametrize("content_type,expected", [
+        ("application/pdf", True),
+        ("text/plain", False),
+    ])
+    def test_has_attachment_type(self, sample_email, content_type, expected):
         """Test attachment type checking."""
-        self.assertTrue(self.sample_email.has_attachment_type("application/pdf"))
-        self.assertFalse(self.sample_email.has_attachment_type("text/plain"))
+        assert sample_email.has_attachment_type(content_type) is expected
 
 
-class TestEmailAttachment(unittest.TestCase):
+class TestEmailAttachment:
     """Test cases for EmailAttachment class."""
     
     def test_attachment_creation(self):
@@ -121,10 +125,10 @@ class TestEmailAttachment(unittest.TestCase):
             content=b"PDF content"
         )
         
-        self.assertEqual(attachment.filename, "document.pdf")
-        self.assertEqual(attachment.content_type, "application/pdf")
-        self.assertEqual(attachment.size, 2048)
-        self.assertEqual(attachment.content, b"PDF content")
+        assert attachment.filename == "document.pdf"
+        assert attachment.content_type == "application/pdf"
+        assert attachment.size == 2048
+        assert attachment.content == b"PDF content"
     
     def test_attachment_to_dict(self):
         """Test attachment dictionary conversion."""
@@ -137,93 +141,47 @@ class TestEmailAttachment(unittest.TestCase):
         
         att_dict = attachment.to_dict()
         
-        self.assertEqual(att_dict['filename'], "test.txt")
-        self.assertEqual(att_dict['content_type'], "text/plain")
-        self.assertEqual(att_dict['size'], 100)
-        self.assertTrue(att_dict['has_content'])
+        assert att_dict['filename'] == "test.txt"
+        assert att_dict['content_type'] == "text/plain"
+        assert att_dict['size'] == 100
+        assert att_dict['has_content']
 
 
-class TestEmailDataAdvanced(unittest.TestCase):
+class TestEmailDataAdvanced:
     """Advanced test cases for EmailData class."""
     
-    def test_from_email_message_simple(self):
+    @pytest.mark.parametrize("parsed_email", [SIMPLE_EMAIL], indirect=True)
+    def test_from_email_message_simple(self, parsed_email):
         """Test creating EmailData from simple EmailMessage."""
-        import email
-        raw_email = """From: sender@example.com
-To: recipient@example.com
-Subject: Test Subject
-Date: Mon, 1 Jan 2024 12:00:00 +0000
-
-Test body content
-"""
-        message = email.message_from_string(raw_email)
-        email_data = EmailData.from_email_message(message)
-        
-        self.assertEqual(email_data.subject, 'Test Subject')
-        self.assertEqual(email_data.sender, 'sender@example.com')
-        self.assertIn('recipient@example.com', email_data.recipients)
+        assert parsed_email.subject == 'Test Subject'
+        assert parsed_email.sender == 'sender@example.com'
+        assert 'recipient@example.com' in parsed_email.recipients
+        assert parsed_email.sent_date is not None
     
-    def test_from_email_message_with_cc_bcc(self):
+    @pytest.mark.parametrize("parsed_email", [CC_BCC_EMAIL], indirect=True)
+    def test_from_email_message_with_cc_bcc(self, parsed_email):
         """Test creating EmailData with CC and BCC."""
-        import email
-        raw_email = """From: sender@example.com
-To: recipient@example.com
-Cc: cc@example.com
-Bcc: bcc@example.com
-Subject: Test with CC/BCC
-
-Body
-"""
-        message = email.message_from_string(raw_email)
-        email_data = EmailData.from_email_message(message)
-        
-        self.assertIn('cc@example.com', email_data.cc_recipients)
-        self.assertIn('bcc@example.com', email_data.bcc_recipients)
-    
-    def test_from_email_message_with_priority(self):
-        """Test creating EmailData with priority header."""
-        import email
-        raw_email = """From: sender@example.com
-To: recipient@example.com
-Subject: High Priority
-X-Priority: 1 (Highest)
-
-High priority email
-"""
-        message = email.message_from_string(raw_email)
-        email_data = EmailData.from_email_message(message)
-        
-        self.assertEqual(email_data.priority, 'high')
-    
-    def test_from_email_message_urgent_priority(self):
-        """Test creating EmailData with urgent priority."""
-        import email
-        raw_email = """From: sender@example.com
-To: recipient@example.com
-Subject: Urgent
-Priority: urgent
-
-Urgent email
-"""
-        message = email.message_from_string(raw_email)
-        email_data = EmailData.from_email_message(message)
-        
-        self.assertEqual(email_data.priority, 'urgent')
-    
-    def test_from_email_message_low_priority(self):
-        """Test creating EmailData with low priority."""
-        import email
-        raw_email = """From: sender@example.com
-To: recipient@example.com
-Subject: Low Priority
-X-Priority: 5
-
-Low priority email
-"""
-        message = email.message_from_string(raw_email)
-        email_data = EmailData.from_email_message(message)
-        
-        self.assertEqual(email_data.priority, 'low')
+        assert parsed_email.subject == 'Test with CC/BCC'
+        assert 'recipient@example.com' in parsed_email.recipients
+        assert 'cc@example.com' in parsed_email.cc_recipients
+        assert 'bcc@example.com' in parsed_email.bcc_recipients
+    
+    @pytest.mark.parametrize("parsed_email", [
+        {"extra": "Cc: a@example.com,  b@example.com , ,"},
+    ], indirect=True)
+    def test_from_email_message_splits_address_list(self, parsed_email):
+        """Test that address headers are split, stripped and empty entries dropped."""
+        assert parsed_email.cc_recipients == ['a@example.com', 'b@example.com']
+        assert parsed_email.bcc_recipients == []
+    
+    @pytest.mark.parametrize("parsed_email,expected_priority", [
+        ({"extra": "X-Priority: 1 (Highest)"}, "high"),
+        ({"extra": "Priority: urgent"}, "urgent"),
+        ({"extra": "X-Priority: 5"}, "low"),
+    ], indirect=["parsed_email"], ids=["high", "urgent", "low"])
+    def test_from_email_message_priority(self, parsed_email, expected_priority):
+        """Test priority detection from the priority headers."""
+        assert parsed_email.priority == expected_priority
     
     def test_sender_domain_extraction(self):
         """Test sender domain extraction."""
@@ -236,14 +194,14 @@ Low priority email
             body_text="Body",
             body_html=None,
             message_id="<test@example.com>",
-            received_date=datetime.now(),
+            received_date=_NOW,
             sent_date=None,
             headers={},
             attachments=[],
             priority="normal"
         )
         
-        self.assertEqual(email_data.sender_domain, 'subdomain.example.com')
+        assert email_data.sender_domain == 'subdomain.example.com'
     
     def test_sender_domain_no_at_sign(self):
         """Test sender domain with invalid email."""
@@ -256,15 +214,15 @@ Low priority email
             body_text="Body",
             body_html=None,
             message_id="<test@example.com>",
-            received_date=datetime.now(),
+            received_date=_NOW,
             sent_date=None,
             headers={},
             attachments=[],
             priority="normal"
         )
         
-        self.assertIsNone(email_data.sender_domain)
+        assert email_data.sender_domain is None
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
@@ -2,20 +2,17 @@
 """
 Tests for the EmailParser class.
 """
-import unittest
-import sys
 from pathlib import Path
 import tempfile
 from datetime import datetime
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from inbound_orchestrator.utils.email_parser import EmailParser
 from inbound_orchestrator.models.email_model import EmailData
 
 
-class TestEmailParser(unittest.TestCase):
+class TestEmailParser:
     """Test cases for EmailParser class."""
     
     def test_from_raw_email(self):
@@ -29,9 +26,9 @@ Test body content
 """
         email_data = EmailParser.from_raw_email(raw_email)
         
-        self.assertIsInstance(email_data, EmailData)
-        self.assertEqual(email_data.subject, 'Test Subject')
-        self.assertEqual(email_data.sender, 'sender@example.com')
+        assert isinstance(email_data, EmailData)
+        assert email_data.subject == 'Test Subject'
+        assert email_data.sender == 'sender@example.com'
     
     def test_from_raw_email_bytes(self):
         """Test parsing email from bytes."""
@@ -43,8 +40,54 @@ Test body
 """
         email_data = EmailParser.from_raw_email(raw_email)
         
-        self.assertIsInstance(email_data, EmailData)
-        self.assertEqual(email_data.subject, 'Test Subject')
+        assert isinstance(email_data, EmailData)
+        assert email_data.subject == 'Test Subject'
+    
+    @pytest.mark.parametrize("raw_email,expected_body", [
+        (b"Content-Type: text/plain; charset=latin-1\n"
+         b"Content-Transfer-Encoding: quoted-printable\n\ncaf=E9\n", "caf\u00e9\n"),
+        (b"\ncaf\xc3\xa9\n", "caf\u00e9\n"),
+        ("\ncaf\u00e9\n", "caf\u00e9\n"),
+    ], ids=["declared-charset", "undeclared-utf8-bytes", "str"])
+    def test_from_raw_email_decoding(self, raw_email, expected_body):
+        """Test that encoded headers and bodies are decoded."""
+        header = "From: sender@example.com\nTo: recipient@example.com\nSubject: =?utf-8?q?caf=C3=A9?=\n"
+        if isinstance(raw_email, bytes):
+            raw_email = header.encode('ascii') + raw_email
+        else:
+            raw_email = header + raw_email
+        
+        email_data = EmailParser.from_raw_email(raw_email)
+        
+        assert email_data.subject == 'caf\u00e9'
+        assert email_data.body_text == expected_body
+        assert all(type(value) is str for value in email_data.headers.values())
+    
+    @pytest.mark.parametrize("attachment,expected", [
+        ("Content-Type: message/rfc822\n"
+         "Content-Disposition: attachment; filename=\"orig.eml\"\n\n"
+         "From: a@example.com\nSubject: Original\n\nOriginal body\n",
+         ("orig.eml", "message/rfc822", 0, b"")),
+        ("Content-Type: text/plain; charset=x-unknown\n"
+         "Content-Disposition: attachment; filename=\"notes.txt\"\n\n"
+         "café\n",
+         ("notes.txt", "text/plain", 5, "café".encode('utf-8'))),
+    ], ids=["forwarded-eml", "unknown-charset"])
+    def test_from_raw_email_attachments(self, attachment, expected):
+        """Test that attachments keep their raw bytes and byte size."""
+        raw_email = (
+            "From: sender@example.com\nTo: recipient@example.com\nSubject: Fwd\n"
+            "Message-ID: <fwd@example.com>\n"
+            "MIME-Version: 1.0\nContent-Type: multipart/mixed; boundary=\"XX\"\n\n"
+            "--XX\nContent-Type: text/plain\n\nSee attached\n"
+            f"--XX\n{attachment}--XX--\n"
+        )
+        email_data = EmailParser.from_raw_email(raw_email)
+        
+        assert type(email_data.message_id) is str
+        attachment_data = email_data.attachments[0]
+        assert (attachment_data.filename, attachment_data.content_type,
+                attachment_data.size, attachment_data.content) == expected
     
     def test_from_file(self):
         """Test parsing email from file."""
@@ -59,18 +102,19 @@ Body content
         
         try:
             email_data = EmailParser.from_file(email_path)
-            self.assertIsInstance(email_data, EmailData)
-            self.assertEqual(email_data.subject, 'File Test')
+            assert isinstance(email_data, EmailData)
+            assert email_data.subject == 'File Test'
         finally:
             Path(email_path).unlink()
     
     def test_from_file_not_found(self):
         """Test parsing from non-existent file."""
-        with self.assertRaises(FileNotFoundError):
+        with pytest.raises(FileNotFoundError):
             EmailParser.from_file('/nonexistent/email.eml')
     
-    def test_from_json_string(self):
-        """Test parsing email from JSON string."""
+    @pytest.mark.parametrize("as_bytes", [False, True], ids=["str", "bytes"])
+    def test_from_json_string(self, as_bytes):
+        """Test parsing email from a JSON string or JSON bytes."""
         json_data = """{
             "subject": "JSON Test",
             "sender": "sender@example.com",
@@ -86,10 +130,12 @@ Body content
             "attachments": [],
             "priority": "normal"
         }"""
+        if as_bytes:
+            json_data = json_data.encode('utf-8')
         
         email_data = EmailParser.from_json(json_data)
-        self.assertIsInstance(email_data, EmailData)
-        self.assertEqual(email_data.subject, 'JSON Test')
+        assert isinstance(email_data, EmailData)
+        assert email_data.subject == 'JSON Test'
     
     def test_from_json_dict(self):
         """Test parsing email from dictionary."""
@@ -110,8 +156,8 @@ Body content
         }
         
         email_data = EmailParser.from_json(json_dict)
-        self.assertIsInstance(email_data, EmailData)
-        self.assertEqual(email_data.subject, 'Dict Test')
+        assert isinstance(email_data, EmailData)
+        assert email_data.subject == 'Dict Test'
     
     def test_batch_parse_directory(self):
         """Test batch parsing emails from directory."""
@@ -132,18 +178,57 @@ Body {i}
             # Parse all emails
             emails = EmailParser.batch_parse_directory(temp_path, pattern='*.eml')
             
-            self.assertEqual(len(emails), 3)
-            self.assertTrue(all(isinstance(e, EmailData) for e in emails))
+            assert len(emails) == 3
+            assert all(isinstance(e, EmailData) for e in emails)
+    
+    def test_batch_parse_directory_threaded(self, tmp_path, mocker):
+        """Test that multi-chunk batches keep file order and skip failures."""
+        for i in range(40):
+            (tmp_path / f'email{i:02d}.eml').write_text(
+                f"From: sender@example.com\nTo: recipient@example.com\nSubject: Email {i:02d}\n\nBody\n"
+            )
+        files = sorted(tmp_path.iterdir())
+        mocker.patch.object(EmailParser, '_list_email_files', return_value=files)
+        from_file = EmailParser.from_file
+        
+        def flaky_from_file(path):
+            if path.name == 'email07.eml':
+                raise ValueError("unreadable")
+            return from_file(path)
+        
+        mocker.patch.object(EmailParser, 'from_file', side_effect=flaky_from_file)
+        
+        emails = EmailParser.batch_parse_directory(tmp_path, max_workers=4)
+        
+        expected = [f'Email {i:02d}' for i in range(40) if i != 7]
+        assert [e.subject for e in emails] == expected
+    
+    @pytest.mark.parametrize("pattern,expected", [
+        ("*.eml", {"a.eml", "b.eml"}),
+        ("a*", {"a.eml", "a.txt"}),
+        ("?.txt", {"a.txt"}),
+        ("*/*.eml", {"c.eml"}),
+    ])
+    def test_list_email_files(self, tmp_path, pattern, expected):
+        """Test which directory entries match the batch parse pattern."""
+        for name in ("a.eml", "b.eml", "a.txt"):
+            (tmp_path / name).write_text("x")
+        (tmp_path / "sub.eml").mkdir()
+        (tmp_path / "sub.eml" / "c.eml").write_text("x")
+        
+        files = EmailParser._list_email_files(tmp_path, pattern)
+        
+        assert {f.name for f in files} == expected
     
     def test_batch_parse_directory_not_found(self):
         """Test batch parsing from non-existent directory."""
-        with self.assertRaises(FileNotFoundError):
+        with pytest.raises(FileNotFoundError):
             EmailParser.batch_parse_directory('/nonexistent/directory')
     
     def test_batch_parse_directory_not_a_directory(self):
         """Test batch parsing from a file path."""
         with tempfile.NamedTemporaryFile() as f:
-            with self.assertRaises(ValueError):
+            with pytest.raises(ValueError):
                 EmailParser.batch_parse_directory(f.name)
     
     def test_batch_parse_directory_with_error(self):
@@ -166,16 +251,16 @@ Valid body
             emails = EmailParser.batch_parse_directory(temp_path, pattern='*.eml')
             
             # At least the valid one should be parsed
-            self.assertGreaterEqual(len(emails), 1)
+            assert len(emails) >= 1
     
     def test_create_sample_email_data(self):
         """Test creating sample email data."""
         sample_email = EmailParser.create_sample_email_data()
         
-        self.assertIsInstance(sample_email, EmailData)
-        self.assertEqual(sample_email.subject, "Sample Email Subject")
-        self.assertEqual(sample_email.sender, "sender@example.com")
-        self.assertGreater(len(sample_email.attachments), 0)
+        assert isinstance(sample_email, EmailData)
+        assert sample_email.subject == "Sample Email Subject"
+        assert sample_email.sender == "sender@example.com"
+        assert len(sample_email.attachments) > 0
     
     def test_validate_email_data_valid(self):
         """Test validating valid email data."""
@@ -195,7 +280,7 @@ Valid body
             priority="normal"
         )
         
-        self.assertTrue(EmailParser.validate_email_data(email_data))
+        assert EmailParser.validate_email_data(email_data)
     
     def test_validate_email_data_no_subject_or_body(self):
         """Test validating email with no subject or body."""
@@ -215,7 +300,7 @@ Valid body
             priority="normal"
         )
         
-        self.assertFalse(EmailParser.validate_email_data(email_data))
+        assert not EmailParser.validate_email_data(email_data)
     
     def test_validate_email_data_no_sender(self):
         """Test validating email with no sender."""
@@ -235,7 +320,7 @@ Valid body
             priority="normal"
         )
         
-        self.assertFalse(EmailParser.validate_email_data(email_data))
+        assert not EmailParser.validate_email_data(email_data)
     
     def test_validate_email_data_no_recipients(self):
         """Test validating email with no recipients."""
@@ -255,7 +340,7 @@ Valid body
             priority="normal"
         )
         
-        self.assertFalse(EmailParser.validate_email_data(email_data))
+        assert not EmailParser.validate_email_data(email_data)
     
     def test_validate_email_data_invalid_address(self):
         """Test validating email with invalid email address."""
@@ -275,8 +360,8 @@ Valid body
             priority="normal"
         )
         
-        self.assertFalse(EmailParser.validate_email_data(email_data))
+        assert not EmailParser.validate_email_data(email_data)
 
 
 if __name__ == '__main__':
-    unittest.main()
+    pytest.main([__file__])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON helpers.
+"""
+from pathlib import Path
+from datetime import datetime
+
+import pytest
+
+from inbound_orchestrator import json_utils
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestJsonUtils:
+    """Test cases for the json_utils helpers."""
+    
+    @pytest.mark.parametrize("data", ['{"a": [1, 2]}', b'{"a": [1, 2]}'], ids=["str", "bytes"])
+    def test_loads(self, backend, data):
+        """Test decoding JSON text and bytes."""
+        assert json_utils.loads(data) == {"a": [1, 2]}
+    
+    def test_dumps_round_trip(self, backend):
+        """Test that dumps output is a str that loads back."""
+        data = {"name": "test", "values": [1, 2, 3]}
+        text = json_utils.dumps(data, indent=2)
+        
+        assert isinstance(text, str)
+        assert "\n" in text
+        assert json_utils.loads(text) == data
+    
+    def test_dumps_non_native_values(self, backend):
+        """Test that unsupported values are stringified instead of failing."""
+        text = json_utils.dumps({"when": datetime(2024, 1, 1, 12, 0, 0), "path": Path("a")})
+        loaded = json_utils.loads(text)
+        
+        assert loaded["when"].startswith("2024-01-01")
+        assert loaded["path"] == "a"
+    
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_dumps_matches_across_backends(self, backend, indent):
+        """Test that both backends produce the same text."""
+        data = {"when": datetime(2024, 1, 1, 12, 0, 0), "name": "caf\u00e9", "values": [1, 2]}
+        expected = {
+            None: '{"when":"2024-01-01T12:00:00","name":"caf\u00e9","values":[1,2]}',
+            2: '{\n  "when": "2024-01-01T12:00:00",\n  "name": "caf\u00e9",\n'
+               '  "values": [\n    1,\n    2\n  ]\n}',
+        }[indent]
+        
+        assert json_utils.dumps(data, indent=indent) == expected
+    
+    def test_dumps_rejects_unsupported_indent(self, backend):
+        """Test that indents orjson can't produce are refused on both backends."""
+        with pytest.raises(ValueError):
+            json_utils.dumps({"a": 1}, indent=4)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
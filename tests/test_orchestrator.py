@@ -2,26 +2,27 @@
 """
 Tests for the InboundOrchestrator class.
 """
-import unittest
-import sys
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import Mock, MagicMock, patch
 import tempfile
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
-from inbound_orchestrator.orchestrator import InboundOrchestrator
+from inbound_orchestrator import orchestrator as orchestrator_module
+from inbound_orchestrator.orchestrator import InboundOrchestrator, PARALLEL_BATCH_THRESHOLD
 from inbound_orchestrator.models.email_model import EmailData
-from inbound_orchestrator.rules.rule_engine import EmailRule
+from inbound_orchestrator.rules.rule_engine import EmailRule, EmailRuleEngine
 from inbound_orchestrator.sqs.sqs_client import SQSQueue
 
+# Fixed timestamp for emails whose dates the tests don't inspect.
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
 
-class TestInboundOrchestrator(unittest.TestCase):
+
+class TestInboundOrchestrator:
     """Test cases for InboundOrchestrator class."""
     
-    def setUp(self):
+    def setup_method(self):
         """Set up test fixtures."""
         self.orchestrator = InboundOrchestrator(default_queue='default')
         
@@ -34,8 +35,8 @@ class TestInboundOrchestrator(unittest.TestCase):
             body_text="Test email body",
             body_html=None,
             message_id="<test@example.com>",
-            received_date=datetime.now(),
-            sent_date=datetime.now(),
+            received_date=_NOW,
+            sent_date=_NOW,
             headers={},
             attachments=[],
             priority="normal"
@@ -43,10 +44,10 @@ class TestInboundOrchestrator(unittest.TestCase):
     
     def test_initialization(self):
         """Test orchestrator initialization."""
-        self.assertEqual(self.orchestrator.default_queue, 'default')
-        self.assertIsNotNone(self.orchestrator.rule_engine)
-        self.assertIsNotNone(self.orchestrator.sqs_client)
-        self.assertIsNotNone(self.orchestrator.stats)
+        assert self.orchestrator.default_queue == 'default'
+        assert self.orchestrator.rule_engine is not None
+        assert self.orchestrator.sqs_client is not None
+        assert self.orchestrator.stats is not None
     
     def test_initialization_with_config(self):
         """Test orchestrator initialization with config file."""
@@ -72,8 +73,8 @@ rules:
         
         try:
             orchestrator = InboundOrchestrator(config_file=config_path, default_queue='default')
-            self.assertEqual(orchestrator.default_queue, 'test_queue')
-            self.assertEqual(len(orchestrator.rule_engine.list_rules()), 1)
+            assert orchestrator.default_queue == 'test_queue'
+            assert len(orchestrator.rule_engine.list_rules()) == 1
         finally:
             Path(config_path).unlink()
     
@@ -88,7 +89,7 @@ rules:
             enabled=True
         )
         self.orchestrator.add_rule(rule)
-        self.assertEqual(len(self.orchestrator.rule_engine.list_rules()), 1)
+        assert len(self.orchestrator.rule_engine.list_rules()) == 1
     
     def test_add_rule_from_dict(self):
         """Test adding a rule from dictionary."""
@@ -101,7 +102,7 @@ rules:
             'enabled': True
         }
         self.orchestrator.add_rule(rule_dict)
-        self.assertEqual(len(self.orchestrator.rule_engine.list_rules()), 1)
+        assert len(self.orchestrator.rule_engine.list_rules()) == 1
     
     def test_add_queue(self):
         """Test adding a queue."""
@@ -111,7 +112,7 @@ rules:
             description="Test queue"
         )
         self.orchestrator.add_queue(queue)
-        self.assertEqual(len(self.orchestrator.sqs_client.list_queues()), 1)
+        assert len(self.orchestrator.sqs_client.list_queues()) == 1
     
     def test_add_queue_from_dict(self):
         """Test adding a queue from dictionary."""
@@ -121,16 +122,16 @@ rules:
             'description': 'Dictionary queue'
         }
         self.orchestrator.add_queue(queue_dict)
-        self.assertEqual(len(self.orchestrator.sqs_client.list_queues()), 1)
+        assert len(self.orchestrator.sqs_client.list_queues()) == 1
     
     def test_process_email_dry_run(self):
         """Test processing email in dry run mode."""
         result = self.orchestrator.process_email(self.sample_email, dry_run=True)
         
-        self.assertTrue(result['success'])
-        self.assertEqual(result['queue_name'], 'default')
-        self.assertTrue(result['dry_run'])
-        self.assertIsNotNone(result['processing_time'])
+        assert result['success']
+        assert result['queue_name'] == 'default'
+        assert result['dry_run']
+        assert result['processing_time'] is not None
     
     def test_process_email_with_matching_rule(self):
         """Test processing email with matching rule."""
@@ -146,10 +147,10 @@ rules:
         
         result = self.orchestrator.process_email(self.sample_email, dry_run=True)
         
-        self.assertTrue(result['success'])
-        self.assertEqual(result['queue_name'], 'test_queue')
-        self.assertIn('test_match', result['matched_rules'])
-        self.assertEqual(result['selected_action'], 'test_queue')
+        assert result['success']
+        assert result['queue_name'] == 'test_queue'
+        assert 'test_match' in result['matched_rules']
+        assert result['selected_action'] == 'test_queue'
     
     def test_process_email_with_custom_attributes(self):
         """Test processing email with custom attributes."""
@@ -160,15 +161,117 @@ rules:
             custom_attributes=custom_attrs
         )
         
-        self.assertTrue(result['success'])
+        assert result['success']
     
     def test_process_emails_batch(self):
         """Test batch processing of emails."""
         emails = [self.sample_email] * 5
         results = self.orchestrator.process_emails_batch(emails, dry_run=True)
         
-        self.assertEqual(len(results), 5)
-        self.assertTrue(all(r['success'] for r in results))
+        assert len(results) == 5
+        assert all(r['success'] for r in results)
+    
+    def test_process_emails_batch_resolves_rules_once(self, mocker):
+        """Test that a batch computes the active rule list a single time."""
+        spy = mocker.spy(self.orchestrator.rule_engine, 'get_active_rules')
+        
+        results = self.orchestrator.process_emails_batch([self.sample_email] * 5, dry_run=True)
+        
+        assert len(results) == 5
+        assert spy.call_count == 1
+    
+    def test_process_emails_batch_parallel(self):
+        """Test that a parallel batch matches the serial results and statistics."""
+        self.orchestrator.add_rule({
+            'name': 'test_rule',
+            'description': 'Test rule',
+            'condition': "contains(subject, 'Test')",
+            'action': 'test_queue',
+            'priority': 100
+        })
+        emails = [self.sample_email] * PARALLEL_BATCH_THRESHOLD
+        
+        results = self.orchestrator.process_emails_batch(
+            emails, dry_run=True, parallel=True, max_workers=2
+        )
+        
+        assert len(results) == PARALLEL_BATCH_THRESHOLD
+        assert all(r['success'] and r['queue_name'] == 'test_queue' for r in results)
+        stats = self.orchestrator.get_statistics()
+        assert stats['total_processed'] == PARALLEL_BATCH_THRESHOLD
+        assert stats['rule_matches'] == {'test_rule': PARALLEL_BATCH_THRESHOLD}
+    
+    def test_process_emails_batch_parallel_small_batch_runs_serially(self, mocker):
+        """Test that batches under the threshold skip the process pool."""
+        parallel = mocker.patch.object(self.orchestrator, '_process_emails_parallel')
+        
+        results = self.orchestrator.process_emails_batch([self.sample_email] * 5, dry_run=True, parallel=True)
+        
+        assert len(results) == 5
+        parallel.assert_not_called()
+    
+    def test_process_emails_batch_parallel_rejects_replaced_sqs_client(self, mocker):
+        """Test that real parallel sends refuse an SQS client workers can't rebuild."""
+        parallel = mocker.patch.object(self.orchestrator, '_process_emails_parallel')
+        mocker.patch.object(self.orchestrator.sqs_client, 'sqs')
+        emails = [self.sample_email] * PARALLEL_BATCH_THRESHOLD
+        
+        with pytest.raises(ValueError):
+            self.orchestrator.process_emails_batch(emails, parallel=True)
+        
+        self.orchestrator.process_emails_batch(emails, dry_run=True, parallel=True)
+        parallel.assert_called_once()
+    
+    def test_init_batch_worker_keeps_memoize_settings(self):
+        """Test that worker orchestrators get the parent's rule engine settings."""
+        self.orchestrator.rule_engine = EmailRuleEngine(memoize=True, memo_size=5)
+        self.orchestrator.add_rule({
+            'name': 'test_rule',
+            'description': 'Test rule',
+            'condition': "contains(subject, 'Test')",
+            'action': 'test_queue'
+        })
+        state = {
+            'aws_kwargs': self.orchestrator._aws_kwargs,
+            'default_queue': 'default',
+            'rules': self.orchestrator.rule_engine.export_rules(),
+            'memoize': True,
+            'memo_size': 5,
+            'queues': []
+        }
+        
+        orchestrator_module._init_batch_worker(state)
+        
+        worker_engine = orchestrator_module._worker_orchestrator.rule_engine
+        assert worker_engine._memo is not None and worker_engine._memo_size == 5
+        assert [rule.name for rule in worker_engine.list_rules()] == ['test_rule']
+    
+    def test_process_email_without_rules_skips_serialization(self, mocker):
+        """Test that an engine with no rules routes to the default queue without to_dict."""
+        to_dict = mocker.spy(EmailData, 'to_dict')
+        
+        result = self.orchestrator.process_email(self.sample_email, dry_run=True)
+        
+        assert result['success']
+        assert result['queue_name'] == 'default'
+        to_dict.assert_not_called()
+    
+    def test_process_email_serializes_once(self, mocker):
+        """Test that rule evaluation and the SQS message share one to_dict call."""
+        self.orchestrator.add_queue(SQSQueue(name='test_queue', url='https://test.com/queue'))
+        self.orchestrator.add_rule({
+            'name': 'test_rule',
+            'description': 'Test rule',
+            'condition': "contains(subject, 'Test')",
+            'action': 'test_queue'
+        })
+        mocker.patch.object(self.orchestrator.sqs_client, 'sqs')
+        to_dict = mocker.spy(EmailData, 'to_dict')
+        
+        result = self.orchestrator.process_email(self.sample_email)
+        
+        assert result['success']
+        assert to_dict.call_count == 1
     
     def test_process_emails_batch_with_error(self):
         """Test batch processing with errors."""
@@ -180,9 +283,9 @@ rules:
         emails = [self.sample_email, bad_email]
         results = self.orchestrator.process_emails_batch(emails, dry_run=True)
         
-        self.assertEqual(len(results), 2)
-        self.assertTrue(results[0]['success'])
-        self.assertFalse(results[1]['success'])
+        assert len(results) == 2
+        assert results[0]['success']
+        assert not results[1]['success']
     
     def test_process_email_from_raw(self):
         """Test processing email from raw content."""
@@ -194,25 +297,42 @@ Date: Mon, 1 Jan 2024 12:00:00 +0000
 Test body content
 """
         result = self.orchestrator.process_email_from_raw(raw_email, dry_run=True)
-        self.assertTrue(result['success'])
-        self.assertEqual(result['subject'], 'Test Subject')
+        assert result['success']
+        assert result['subject'] == 'Test Subject'
     
     def test_test_rule(self):
         """Test rule testing functionality."""
         test_emails = [self.sample_email]
         results = self.orchestrator.test_rule("contains(subject, 'Test')", test_emails)
         
-        self.assertEqual(results['total_emails'], 1)
-        self.assertEqual(results['matches'], 1)
-        self.assertEqual(results['errors'], 0)
+        assert results['total_emails'] == 1
+        assert results['matches'] == 1
+        assert results['errors'] == 0
     
     def test_test_rule_no_match(self):
         """Test rule testing with no matches."""
         test_emails = [self.sample_email]
         results = self.orchestrator.test_rule("priority == 'urgent'", test_emails)
         
-        self.assertEqual(results['total_emails'], 1)
-        self.assertEqual(results['matches'], 0)
+        assert results['total_emails'] == 1
+        assert results['matches'] == 0
+    
+    def test_test_rule_compiles_once(self, mocker):
+        """Test that a condition is compiled once for all test emails."""
+        spy = mocker.spy(self.orchestrator.rule_engine, 'compile_condition')
+        
+        results = self.orchestrator.test_rule("contains(subject, 'Test')", [self.sample_email] * 3)
+        
+        assert results['matches'] == 3
+        assert spy.call_count == 1
+    
+    def test_test_rule_invalid_syntax(self):
+        """Test rule testing with a condition that doesn't compile."""
+        results = self.orchestrator.test_rule("invalid syntax!!!", [self.sample_email])
+        
+        assert results['total_emails'] == 1
+        assert results['matches'] == 0
+        assert results['errors'] == 0
     
     def test_get_statistics(self):
         """Test statistics retrieval."""
@@ -221,11 +341,26 @@ Test body content
         
         stats = self.orchestrator.get_statistics()
         
-        self.assertIn('total_processed', stats)
-        self.assertIn('successful_routes', stats)
-        self.assertIn('failed_routes', stats)
-        self.assertIn('success_rate', stats)
-        self.assertEqual(stats['total_processed'], 1)
+        assert 'total_processed' in stats
+        assert 'successful_routes' in stats
+        assert 'failed_routes' in stats
+        assert 'success_rate' in stats
+        assert stats['total_processed'] == 1
+    
+    def test_statistics_count_routes_and_queue_usage(self, mocker):
+        """Test that successful sends are counted per queue."""
+        mocker.patch.object(self.orchestrator.sqs_client, 'send_email_message',
+                            side_effect=[True, True, False])
+        for _ in range(3):
+            self.orchestrator.process_email(self.sample_email)
+        
+        stats = self.orchestrator.get_statistics()
+        assert stats['total_processed'] == 3
+        assert stats['successful_routes'] == 2
+        assert stats['failed_routes'] == 1
+        assert stats['queue_usage'] == {'default': 2}
+        assert type(stats['queue_usage']) is dict
+        assert self.orchestrator.stats['queue_usage'] == {'default': 2}
     
     def test_reset_statistics(self):
         """Test statistics reset."""
@@ -233,16 +368,16 @@ Test body content
         self.orchestrator.reset_statistics()
         
         stats = self.orchestrator.get_statistics()
-        self.assertEqual(stats['total_processed'], 0)
+        assert stats['total_processed'] == 0
     
     def test_health_check(self):
         """Test health check."""
         health = self.orchestrator.health_check()
         
-        self.assertIn('overall_status', health)
-        self.assertIn('components', health)
-        self.assertIn('rule_engine', health['components'])
-        self.assertIn('sqs_client', health['components'])
+        assert 'overall_status' in health
+        assert 'components' in health
+        assert 'rule_engine' in health['components']
+        assert 'sqs_client' in health['components']
     
     def test_save_configuration(self):
         """Test saving configuration."""
@@ -261,23 +396,23 @@ Test body content
             })
             
             self.orchestrator.save_configuration(config_path)
-            self.assertTrue(Path(config_path).exists())
+            assert Path(config_path).exists()
         finally:
             Path(config_path).unlink()
     
     def test_save_configuration_no_file(self):
         """Test saving configuration without file specified."""
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             self.orchestrator.save_configuration()
     
     def test_str_repr(self):
         """Test string representation."""
         str_repr = str(self.orchestrator)
-        self.assertIn('InboundOrchestrator', str_repr)
+        assert 'InboundOrchestrator' in str_repr
         
         repr_str = repr(self.orchestrator)
-        self.assertIn('InboundOrchestrator', repr_str)
+        assert 'InboundOrchestrator' in repr_str
 
 
 if __name__ == '__main__':
-    unittest.main()
+    pytest.main([__file__])
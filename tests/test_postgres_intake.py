@@ -2,43 +2,30 @@
 """
 Tests for the Postgres email intake functionality.
 """
-import unittest
-import sys
-from pathlib import Path
 from datetime import datetime
 from unittest.mock import Mock, MagicMock, patch
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
+pytest.importorskip("psycopg2", reason="psycopg2 not available - skipping Postgres tests")
+
+from psycopg2 import sql
+
+from inbound_orchestrator import InboundOrchestrator, json_utils
+from inbound_orchestrator.intake import PostgresEmailIntake
 from inbound_orchestrator.models.email_model import EmailData
 
 
-class TestPostgresEmailIntake(unittest.TestCase):
+class TestPostgresEmailIntake:
     """Test cases for PostgresEmailIntake class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Check if psycopg2 is available
-        try:
-            from inbound_orchestrator.intake import PostgresEmailIntake
-            self.PostgresEmailIntake = PostgresEmailIntake
-            self.psycopg2_available = True
-        except ImportError:
-            self.psycopg2_available = False
-            self.skipTest("psycopg2 not available - skipping Postgres tests")
-    
     def test_import_postgres_intake(self):
         """Test that PostgresEmailIntake can be imported."""
-        self.assertTrue(self.psycopg2_available)
-        self.assertIsNotNone(self.PostgresEmailIntake)
+        assert PostgresEmailIntake is not None
     
     def test_postgres_intake_initialization(self):
         """Test PostgresEmailIntake initialization."""
-        if not self.psycopg2_available:
-            self.skipTest("psycopg2 not available")
-        
-        intake = self.PostgresEmailIntake(
+        intake = PostgresEmailIntake(
             host='localhost',
             port=5432,
             database='test_db',
@@ -47,18 +34,15 @@ class TestPostgresEmailIntake(unittest.TestCase):
             schema='email_messages'
         )
         
-        self.assertEqual(intake.connection_params['host'], 'localhost')
-        self.assertEqual(intake.connection_params['port'], 5432)
-        self.assertEqual(intake.connection_params['database'], 'test_db')
-        self.assertEqual(intake.connection_params['user'], 'test_user')
-        self.assertEqual(intake.schema, 'email_messages')
+        assert intake.connection_params['host'] == 'localhost'
+        assert intake.connection_params['port'] == 5432
+        assert intake.connection_params['database'] == 'test_db'
+        assert intake.connection_params['user'] == 'test_user'
+        assert intake.schema == 'email_messages'
     
     def test_map_row_to_email_data(self):
         """Test mapping database row to EmailData object."""
-        if not self.psycopg2_available:
-            self.skipTest("psycopg2 not available")
-        
-        intake = self.PostgresEmailIntake(
+        intake = PostgresEmailIntake(
             host='localhost',
             database='test_db',
             user='test_user',
@@ -84,19 +68,16 @@ class TestPostgresEmailIntake(unittest.TestCase):
         
         email_data = intake._map_row_to_email_data(test_row)
         
-        self.assertIsInstance(email_data, EmailData)
-        self.assertEqual(email_data.subject, 'Test Subject')
-        self.assertEqual(email_data.body_text, 'Test body content')
-        self.assertEqual(email_data.sender, 'sender@example.com')
-        self.assertEqual(email_data.message_id, '<test@example.com>')
-        self.assertIn('recipient@example.com', email_data.recipients)
+        assert isinstance(email_data, EmailData)
+        assert email_data.subject == 'Test Subject'
+        assert email_data.body_text == 'Test body content'
+        assert email_data.sender == 'sender@example.com'
+        assert email_data.message_id == '<test@example.com>'
+        assert 'recipient@example.com' in email_data.recipients
     
     def test_map_row_with_json_object(self):
         """Test mapping database row with recipients in json_object."""
-        if not self.psycopg2_available:
-            self.skipTest("psycopg2 not available")
-        
-        intake = self.PostgresEmailIntake(
+        intake = PostgresEmailIntake(
             host='localhost',
             database='test_db',
             user='test_user',
@@ -122,18 +103,15 @@ class TestPostgresEmailIntake(unittest.TestCase):
         
         email_data = intake._map_row_to_email_data(test_row)
         
-        self.assertIsInstance(email_data, EmailData)
-        self.assertEqual(len(email_data.recipients), 2)
-        self.assertIn('recipient1@example.com', email_data.recipients)
-        self.assertIn('recipient2@example.com', email_data.recipients)
-        self.assertIn('cc1@example.com', email_data.cc_recipients)
+        assert isinstance(email_data, EmailData)
+        assert len(email_data.recipients) == 2
+        assert 'recipient1@example.com' in email_data.recipients
+        assert 'recipient2@example.com' in email_data.recipients
+        assert 'cc1@example.com' in email_data.cc_recipients
     
     def test_map_row_with_default_recipients(self):
         """Test mapping database row with missing recipients."""
-        if not self.psycopg2_available:
-            self.skipTest("psycopg2 not available")
-        
-        intake = self.PostgresEmailIntake(
+        intake = PostgresEmailIntake(
             host='localhost',
             database='test_db',
             user='test_user',
@@ -155,38 +133,110 @@ class TestPostgresEmailIntake(unittest.TestCase):
         
         email_data = intake._map_row_to_email_data(test_row)
         
-        self.assertIsInstance(email_data, EmailData)
+        assert isinstance(email_data, EmailData)
         # Should use default recipient when none available
-        self.assertEqual(email_data.recipients, ['unknown@localhost'])
+        assert email_data.recipients == ['unknown@localhost']
+    
+    def test_map_row_splits_address_strings(self):
+        """Test comma-separated To/cc strings are split and stripped."""
+        intake = PostgresEmailIntake(database='test_db', user='test_user', password='test_pass')
+        test_row = {
+            'em_id': 4,
+            'headers': {'To': ' a@example.com , ,b@example.com'},
+            'json_object': {'to': 'ignored@example.com', 'cc': 'c@example.com, d@example.com'},
+        }
 
+        email_data = intake._map_row_to_email_data(test_row)
 
-class TestOrchestratorPostgresIntegration(unittest.TestCase):
-    """Test cases for InboundOrchestrator Postgres integration."""
+        assert email_data.recipients == ['a@example.com', 'b@example.com']
+        # json_object is only consulted when the headers yield no recipients
+        assert email_data.cc_recipients == []
+
+    def test_connect_registers_json_loaders(self):
+        """Test that connect() decodes json/jsonb columns with json_utils.loads."""
+        module = 'inbound_orchestrator.intake.postgres_email_intake'
+        intake = PostgresEmailIntake(database='test_db', user='test_user', password='test_pass')
+        with patch(f'{module}.psycopg2') as mock_psycopg2, \
+                patch(f'{module}.register_default_json') as mock_json, \
+                patch(f'{module}.register_default_jsonb') as mock_jsonb:
+            intake.connect()
+
+        conn = mock_psycopg2.connect.return_value
+        mock_json.assert_called_once_with(conn, loads=json_utils.loads)
+        mock_jsonb.assert_called_once_with(conn, loads=json_utils.loads)
+
+    def test_iter_emails_by_email_id_streams_rows(self):
+        """Test that rows stream through a named server-side cursor."""
+        intake = PostgresEmailIntake(host='localhost', database='test_db')
+        intake._connection = MagicMock()
+        cursor = intake._connection.cursor.return_value.__enter__.return_value
+        good_row = {'em_id': 1, 'subject': 'Streamed', 'body': 'Body',
+                    'from_address': 'sender@example.com', 'headers': {}}
+        cursor.__iter__.return_value = iter([good_row, {'em_id': 2, 'time_received': 'not a date'}, good_row])
+        
+        with patch.object(intake, '_build_email_query', return_value='SELECT 1'):
+            emails = intake.iter_emails_by_email_id(7, itersize=50)
+            assert not intake._connection.cursor.called  # nothing runs until iterated
+            subjects = [email_data.subject for email_data in emails]
+        
+        # The second row fails to map (bad timestamp) and is skipped
+        assert subjects == ['Streamed', 'Streamed']
+        first_name = intake._connection.cursor.call_args.kwargs['name']
+        assert first_name.startswith('emails_')
+        assert cursor.itersize == 50
+        cursor.execute.assert_called_once_with('SELECT 1', (7,))
+        
+        # A second stream gets its own cursor name
+        with patch.object(intake, '_build_email_query', return_value='SELECT 1'):
+            list(intake.iter_emails_by_email_id(7))
+        assert intake._connection.cursor.call_args.kwargs['name'] != first_name
     
-    def setUp(self):
-        """Set up test fixtures."""
-        try:
-            from inbound_orchestrator import InboundOrchestrator
-            from inbound_orchestrator.intake import PostgresEmailIntake
-            self.InboundOrchestrator = InboundOrchestrator
-            self.PostgresEmailIntake = PostgresEmailIntake
-            self.psycopg2_available = True
-        except ImportError:
-            self.psycopg2_available = False
-            self.skipTest("Dependencies not available - skipping integration tests")
+    def test_iter_emails_by_email_id_not_connected(self):
+        """Test that streaming requires a connection."""
+        intake = PostgresEmailIntake(host='localhost', database='test_db')
+        
+        with pytest.raises(RuntimeError):
+            list(intake.iter_emails_by_email_id(7))
+    
+    def test_fetch_emails_by_email_id_returns_list(self):
+        """Test that fetch_emails_by_email_id collects the stream."""
+        intake = PostgresEmailIntake(host='localhost', database='test_db')
+        email_data = Mock(spec=EmailData)
+        
+        with patch.object(intake, 'iter_emails_by_email_id', return_value=iter([email_data])):
+            assert intake.fetch_emails_by_email_id(7) == [email_data]
+    
+    def test_iter_all_emails_streams_rows(self):
+        """Test that fetching all emails streams through a named cursor."""
+        intake = PostgresEmailIntake(host='localhost', database='test_db')
+        intake._connection = MagicMock()
+        cursor = intake._connection.cursor.return_value.__enter__.return_value
+        row = {'em_id': 1, 'subject': 'Streamed', 'body': 'Body',
+               'from_address': 'sender@example.com', 'headers': {}}
+        cursor.__iter__.return_value = iter([row, row])
+        
+        with patch.object(intake, '_build_email_query', return_value=sql.SQL('SELECT 1')):
+            emails = intake.fetch_all_emails(limit=2)
+        
+        assert [email_data.subject for email_data in emails] == ['Streamed', 'Streamed']
+        assert intake._connection.cursor.call_args.kwargs['name'].startswith('emails_')
+        assert cursor.itersize == 500
+        assert cursor.execute.call_args.args[1] == (2,)
+        cursor.fetchall.assert_not_called()
+
+
+class TestOrchestratorPostgresIntegration:
+    """Test cases for InboundOrchestrator Postgres integration."""
     
     @patch('inbound_orchestrator.intake.postgres_email_intake.psycopg2')
     def test_process_postgres_emails(self, mock_psycopg2):
         """Test process_postgres_emails method with mocked database."""
-        if not self.psycopg2_available:
-            self.skipTest("Dependencies not available")
-        
         # Create orchestrator
-        orchestrator = self.InboundOrchestrator(default_queue='default')
+        orchestrator = InboundOrchestrator(default_queue='default')
         
         # Create mock Postgres intake
         mock_intake = MagicMock()
-        mock_intake.fetch_emails_by_email_id.return_value = [
+        mock_intake.iter_emails_by_email_id.return_value = [
             EmailData(
                 subject='Test Email',
                 sender='test@example.com',
@@ -212,23 +262,20 @@ class TestOrchestratorPostgresIntegration(unittest.TestCase):
         )
         
         # Verify results
-        self.assertEqual(result['email_id'], 33)
-        self.assertEqual(result['email_count'], 1)
-        self.assertEqual(result['processed'], 1)
-        self.assertTrue(result['successful'] > 0 or result['failed'] > 0)
-        mock_intake.fetch_emails_by_email_id.assert_called_once_with(33)
+        assert result['email_id'] == 33
+        assert result['email_count'] == 1
+        assert result['processed'] == 1
+        assert result['successful'] > 0 or result['failed'] > 0
+        mock_intake.iter_emails_by_email_id.assert_called_once_with(33)
     
     @patch('inbound_orchestrator.intake.postgres_email_intake.psycopg2')
     def test_process_postgres_emails_no_results(self, mock_psycopg2):
         """Test process_postgres_emails with no emails found."""
-        if not self.psycopg2_available:
-            self.skipTest("Dependencies not available")
-        
-        orchestrator = self.InboundOrchestrator(default_queue='default')
+        orchestrator = InboundOrchestrator(default_queue='default')
         
         # Create mock intake with no emails
         mock_intake = MagicMock()
-        mock_intake.fetch_emails_by_email_id.return_value = []
+        mock_intake.iter_emails_by_email_id.return_value = []
         
         result = orchestrator.process_postgres_emails(
             postgres_intake=mock_intake,
@@ -237,11 +284,51 @@ class TestOrchestratorPostgresIntegration(unittest.TestCase):
         )
         
         # Verify empty results
-        self.assertEqual(result['email_id'], 99)
-        self.assertEqual(result['email_count'], 0)
-        self.assertEqual(result['processed'], 0)
-        self.assertEqual(result['successful'], 0)
+        assert result['email_id'] == 99
+        assert result['email_count'] == 0
+        assert result['processed'] == 0
+        assert result['successful'] == 0
+
+    
+    def test_process_postgres_emails_in_batches(self, mocker):
+        """Test that streamed emails are processed in POSTGRES_BATCH_SIZE batches."""
+        mocker.patch('inbound_orchestrator.orchestrator.POSTGRES_BATCH_SIZE', 2)
+        orchestrator = InboundOrchestrator(default_queue='default')
+        batch = mocker.spy(orchestrator, 'process_emails_batch')
+        email_data = EmailData(
+            subject='Test Email', sender='test@example.com',
+            recipients=['recipient@example.com'], cc_recipients=[], bcc_recipients=[],
+            body_text='Test body', body_html=None, message_id='<test@example.com>',
+            received_date=datetime(2024, 1, 1, 12, 0, 0), sent_date=None,
+            headers={}, attachments=[]
+        )
+        mock_intake = MagicMock()
+        mock_intake.iter_emails_by_email_id.return_value = iter([email_data] * 5)
+        
+        result = orchestrator.process_postgres_emails(mock_intake, email_id=33, dry_run=True)
+        
+        assert result['email_count'] == 5
+        assert result['successful'] == 5
+        assert [len(call.args[0]) for call in batch.call_args_list] == [2, 2, 1]
+    
+    def test_process_postgres_emails_fetch_only_intake(self, mocker):
+        """Test that intakes with only fetch_emails_by_email_id are still supported."""
+        orchestrator = InboundOrchestrator(default_queue='default')
+        email_data = EmailData(
+            subject='Test Email', sender='test@example.com',
+            recipients=['recipient@example.com'], cc_recipients=[], bcc_recipients=[],
+            body_text='Test body', body_html=None, message_id='<test@example.com>',
+            received_date=datetime(2024, 1, 1, 12, 0, 0), sent_date=None,
+            headers={}, attachments=[]
+        )
+        mock_intake = mocker.Mock(spec=['fetch_emails_by_email_id'])
+        mock_intake.fetch_emails_by_email_id.return_value = [email_data] * 3
+        
+        result = orchestrator.process_postgres_emails(mock_intake, email_id=33, dry_run=True)
+        
+        assert result['email_count'] == 3
+        mock_intake.fetch_emails_by_email_id.assert_called_once_with(33)
 
 
 if __name__ == '__main__':
-    unittest.main()
+    pytest.main([__file__])
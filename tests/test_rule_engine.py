@@ -2,22 +2,42 @@
 """
 Tests for the EmailRuleEngine.
 """
-import unittest
-import sys
-from pathlib import Path
+import pickle
 from datetime import datetime
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
+from inbound_orchestrator.rules import rule_engine as rule_engine_module
 from inbound_orchestrator.rules.rule_engine import EmailRuleEngine, EmailRule
 from inbound_orchestrator.models.email_model import EmailData
 
+# Fixed timestamp for emails whose dates the tests don't inspect.
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
 
-class TestEmailRuleEngine(unittest.TestCase):
+
+class TestEmailRuleEngine:
     """Test cases for EmailRuleEngine class."""
     
-    def setUp(self):
+    @classmethod
+    def setup_class(cls):
+        """Create the sample email once; tests must not mutate it."""
+        cls.sample_email = EmailData(
+            subject="URGENT: Need help with login",
+            sender="user@example.com",
+            recipients=["support@company.com"],
+            cc_recipients=[],
+            bcc_recipients=[],
+            body_text="I urgently need help with my login issue.",
+            body_html=None,
+            message_id="<test@example.com>",
+            received_date=_NOW,
+            sent_date=_NOW,
+            headers={},
+            attachments=[],
+            priority="urgent"
+        )
+    
+    def setup_method(self):
         """Set up test fixtures."""
         self.engine = EmailRuleEngine()
         
@@ -39,38 +59,21 @@ class TestEmailRuleEngine(unittest.TestCase):
             priority=80,
             enabled=True
         )
-        
-        # Create sample email
-        self.sample_email = EmailData(
-            subject="URGENT: Need help with login",
-            sender="user@example.com",
-            recipients=["support@company.com"],
-            cc_recipients=[],
-            bcc_recipients=[],
-            body_text="I urgently need help with my login issue.",
-            body_html=None,
-            message_id="<test@example.com>",
-            received_date=datetime.now(),
-            sent_date=datetime.now(),
-            headers={},
-            attachments=[],
-            priority="urgent"
-        )
     
     def test_add_rule(self):
         """Test adding rules to the engine."""
         self.engine.add_rule(self.urgent_rule)
-        self.assertEqual(len(self.engine.list_rules()), 1)
+        assert len(self.engine.list_rules()) == 1
         
         rules = self.engine.list_rules()
-        self.assertEqual(rules[0].name, "urgent_emails")
+        assert rules[0].name == "urgent_emails"
     
     def test_add_multiple_rules(self):
         """Test adding multiple rules."""
         rules = [self.urgent_rule, self.support_rule]
         self.engine.add_rules(rules)
         
-        self.assertEqual(len(self.engine.list_rules()), 2)
+        assert len(self.engine.list_rules()) == 2
     
     def test_invalid_rule_syntax(self):
         """Test handling of invalid rule syntax."""
@@ -83,7 +86,7 @@ class TestEmailRuleEngine(unittest.TestCase):
             enabled=True
         )
         
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             self.engine.add_rule(invalid_rule)
     
     def test_evaluate_email(self):
@@ -94,11 +97,27 @@ class TestEmailRuleEngine(unittest.TestCase):
         matching_rules = self.engine.evaluate_email(self.sample_email)
         
         # Should match both rules (urgent and support)
-        self.assertEqual(len(matching_rules), 2)
+        assert len(matching_rules) == 2
         
         # Should be sorted by priority (urgent rule first)
-        self.assertEqual(matching_rules[0].name, "urgent_emails")
-        self.assertEqual(matching_rules[1].name, "support_emails")
+        assert matching_rules[0].name == "urgent_emails"
+        assert matching_rules[1].name == "support_emails"
+    
+    def test_evaluate_email_regex_condition(self):
+        """Test a keyword rule written as a single case-insensitive regex search."""
+        regex_rule = EmailRule(
+            name="support_regex",
+            description="Route support emails",
+            condition="subject =~~ '(?i)HELP|support'",
+            action="support_queue",
+            priority=80,
+            enabled=True
+        )
+        self.engine.add_rule(regex_rule)
+        
+        matching_rules = self.engine.evaluate_email(self.sample_email)
+        assert [rule.name for rule in matching_rules] == ["support_regex"]
+        assert not self.engine.test_rule("subject =~~ '(?i)invoice|billing'", self.sample_email)
     
     def test_get_first_matching_action(self):
         """Test getting the first matching action."""
@@ -106,58 +125,62 @@ class TestEmailRuleEngine(unittest.TestCase):
         self.engine.add_rule(self.support_rule)
         
         action = self.engine.get_first_matching_action(self.sample_email)
-        self.assertEqual(action, "high_priority")  # Highest priority rule
+        assert action == "high_priority"  # Highest priority rule
     
     def test_rule_enable_disable(self):
         """Test enabling and disabling rules."""
         self.engine.add_rule(self.urgent_rule)
         
         # Disable the rule
-        self.assertTrue(self.engine.disable_rule("urgent_emails"))
+        assert self.engine.disable_rule("urgent_emails")
         
         # Should not match disabled rule
         matching_rules = self.engine.evaluate_email(self.sample_email)
-        self.assertEqual(len(matching_rules), 0)
+        assert len(matching_rules) == 0
         
         # Re-enable the rule
-        self.assertTrue(self.engine.enable_rule("urgent_emails"))
+        assert self.engine.enable_rule("urgent_emails")
         
         # Should match again
         matching_rules = self.engine.evaluate_email(self.sample_email)
-        self.assertEqual(len(matching_rules), 1)
+        assert len(matching_rules) == 1
     
     def test_remove_rule(self):
         """Test removing rules."""
         self.engine.add_rule(self.urgent_rule)
-        self.assertEqual(len(self.engine.list_rules()), 1)
+        assert len(self.engine.list_rules()) == 1
         
         # Remove the rule
-        self.assertTrue(self.engine.remove_rule("urgent_emails"))
-        self.assertEqual(len(self.engine.list_rules()), 0)
+        assert self.engine.remove_rule("urgent_emails")
+        assert len(self.engine.list_rules()) == 0
         
         # Try to remove non-existent rule
-        self.assertFalse(self.engine.remove_rule("non_existent"))
+        assert not self.engine.remove_rule("non_existent")
     
     def test_validate_rule_syntax(self):
         """Test rule syntax validation."""
         # Valid syntax
-        self.assertTrue(self.engine.validate_rule_syntax("priority == 'urgent'"))
-        self.assertTrue(self.engine.validate_rule_syntax("contains(subject, 'test')"))
+        assert self.engine.validate_rule_syntax("priority == 'urgent'")
+        assert self.engine.validate_rule_syntax("contains(subject, 'test')")
         
         # Invalid syntax
-        self.assertFalse(self.engine.validate_rule_syntax("invalid syntax!!!"))
+        assert not self.engine.validate_rule_syntax("invalid syntax!!!")
     
     def test_test_rule(self):
         """Test rule testing functionality."""
         # Test condition that should match
-        self.assertTrue(
-            self.engine.test_rule("priority == 'urgent'", self.sample_email)
-        )
+        assert self.engine.test_rule("priority == 'urgent'", self.sample_email)
         
         # Test condition that should not match
-        self.assertFalse(
-            self.engine.test_rule("priority == 'low'", self.sample_email)
-        )
+        assert not self.engine.test_rule("priority == 'low'", self.sample_email)
+    
+    def test_test_rule_context_helpers(self):
+        """Test the per-email context values available to conditions."""
+        assert self.engine.test_rule("contains(subject, 'urgent')", self.sample_email)
+        assert self.engine.test_rule("has_keyword('login')", self.sample_email)
+        assert not self.engine.test_rule("is_gmail or is_outlook", self.sample_email)
+        assert self.engine.test_rule("subject =~~ '(?i)help|login'", self.sample_email)
+        assert self.engine.test_rule("is_business_hours != is_after_hours", self.sample_email)
     
     def test_export_import_rules(self):
         """Test rule export and import."""
@@ -166,17 +189,30 @@ class TestEmailRuleEngine(unittest.TestCase):
         
         # Export rules
         exported = self.engine.export_rules()
-        self.assertEqual(len(exported), 2)
+        assert len(exported) == 2
         
         # Clear and import
         self.engine.clear_rules()
-        self.assertEqual(len(self.engine.list_rules()), 0)
+        assert len(self.engine.list_rules()) == 0
         
         self.engine.import_rules(exported)
-        self.assertEqual(len(self.engine.list_rules()), 2)
+        assert len(self.engine.list_rules()) == 2
+    
+    def test_export_import_json(self):
+        """Test rule export and import through JSON text."""
+        self.engine.add_rule(self.urgent_rule)
+        self.engine.add_rule(self.support_rule)
+        exported = self.engine.export_json()
+        
+        engine = EmailRuleEngine()
+        engine.import_json(exported.encode('utf-8'))
+        assert engine.export_rules() == self.engine.export_rules()
+        
+        engine.import_json(exported, clear_existing=True)
+        assert len(engine.list_rules()) == 2
 
 
-class TestEmailRule(unittest.TestCase):
+class TestEmailRule:
     """Test cases for EmailRule class."""
     
     def test_rule_creation(self):
@@ -191,12 +227,12 @@ class TestEmailRule(unittest.TestCase):
             metadata={"category": "test"}
         )
         
-        self.assertEqual(rule.name, "test_rule")
-        self.assertEqual(rule.condition, "priority == 'high'")
-        self.assertEqual(rule.action, "test_queue")
-        self.assertEqual(rule.priority, 50)
-        self.assertTrue(rule.enabled)
-        self.assertEqual(rule.metadata["category"], "test")
+        assert rule.name == "test_rule"
+        assert rule.condition == "priority == 'high'"
+        assert rule.action == "test_queue"
+        assert rule.priority == 50
+        assert rule.enabled
+        assert rule.metadata["category"] == "test"
     
     def test_rule_to_dict(self):
         """Test rule dictionary conversion."""
@@ -211,11 +247,11 @@ class TestEmailRule(unittest.TestCase):
         
         rule_dict = rule.to_dict()
         
-        self.assertEqual(rule_dict['name'], "dict_rule")
-        self.assertEqual(rule_dict['condition'], "contains(subject, 'test')")
-        self.assertEqual(rule_dict['action'], "dict_queue")
-        self.assertEqual(rule_dict['priority'], 75)
-        self.assertFalse(rule_dict['enabled'])
+        assert rule_dict['name'] == "dict_rule"
+        assert rule_dict['condition'] == "contains(subject, 'test')"
+        assert rule_dict['action'] == "dict_queue"
+        assert rule_dict['priority'] == 75
+        assert not rule_dict['enabled']
     
     def test_rule_from_dict(self):
         """Test rule creation from dictionary."""
@@ -231,21 +267,39 @@ class TestEmailRule(unittest.TestCase):
         
         rule = EmailRule.from_dict(rule_dict)
         
-        self.assertEqual(rule.name, 'from_dict_rule')
-        self.assertEqual(rule.condition, 'sender_domain == "example.com"')
-        self.assertEqual(rule.action, 'from_dict_queue')
-        self.assertEqual(rule.priority, 60)
-        self.assertTrue(rule.enabled)
-        self.assertEqual(rule.metadata['source'], 'dict')
+        assert rule.name == 'from_dict_rule'
+        assert rule.condition == 'sender_domain == "example.com"'
+        assert rule.action == 'from_dict_queue'
+        assert rule.priority == 60
+        assert rule.enabled
+        assert rule.metadata['source'] == 'dict'
+    
+    def test_rule_slots(self):
+        """Test that rules use __slots__ and still pickle for worker processes."""
+        rule = EmailRule("slotted", "Slotted", "true", "queue", metadata={'k': 'v'})
+        assert not hasattr(rule, '__dict__')
+        with pytest.raises(AttributeError):
+            rule.not_a_field = True
+        assert pickle.loads(pickle.dumps(rule)) == rule
+    
+    def test_rule_strings_interned(self):
+        """Test that rules built separately share their name/action strings."""
+        action = "".join(["shared", "_queue"])
+        first = EmailRule("".join(["same", "_name"]), "A", "true", action)
+        second = EmailRule.from_dict({'name': 'same_name', 'description': 'B',
+                                      'condition': 'true', 'action': 'shared_queue'})
+        
+        assert first.name is second.name
+        assert first.action is second.action
 
 
-class TestEmailRuleEngineAdvanced(unittest.TestCase):
+class TestEmailRuleEngineAdvanced:
     """Additional test cases for EmailRuleEngine."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.engine = EmailRuleEngine()
-        self.sample_email = EmailData(
+    @classmethod
+    def setup_class(cls):
+        """Create the sample email once; tests must not mutate it."""
+        cls.sample_email = EmailData(
             subject="Test Email",
             sender="user@example.com",
             recipients=["support@company.com"],
@@ -254,13 +308,17 @@ class TestEmailRuleEngineAdvanced(unittest.TestCase):
             body_text="Test body content.",
             body_html=None,
             message_id="<test@example.com>",
-            received_date=datetime.now(),
-            sent_date=datetime.now(),
+            received_date=_NOW,
+            sent_date=_NOW,
             headers={},
             attachments=[],
             priority="normal"
         )
     
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = EmailRuleEngine()
+    
     def test_get_rule(self):
         """Test getting a rule by name."""
         rule = EmailRule(
@@ -274,13 +332,31 @@ class TestEmailRuleEngineAdvanced(unittest.TestCase):
         self.engine.add_rule(rule)
         
         retrieved = self.engine.get_rule("get_test")
-        self.assertIsNotNone(retrieved)
-        self.assertEqual(retrieved.name, "get_test")
+        assert retrieved is not None
+        assert retrieved.name == "get_test"
+    
+    def test_add_duplicate_rule_name(self):
+        """Test that rule names must be unique."""
+        self.engine.add_rule(EmailRule("dup", "First", "true", "queue1"))
+        with pytest.raises(ValueError, match="already exists"):
+            self.engine.add_rule(EmailRule("dup", "Second", "false", "queue2"))
+        assert self.engine.get_rule("dup").action == "queue1"
+        assert len(self.engine.list_rules()) == 1
+    
+    def test_remove_rule_after_priority_change(self):
+        """Test removing a rule whose priority was changed in place."""
+        self.engine.add_rule(EmailRule("a", "A", "true", "queue", priority=10))
+        self.engine.add_rule(EmailRule("b", "B", "true", "queue", priority=20))
+        self.engine.get_rule("a").priority = 30
+        
+        assert self.engine.remove_rule("a")
+        assert not self.engine.remove_rule("a")
+        assert [rule.name for rule, _ in self.engine.get_active_rules()] == ["b"]
     
     def test_get_nonexistent_rule(self):
         """Test getting a non-existent rule."""
         retrieved = self.engine.get_rule("nonexistent")
-        self.assertIsNone(retrieved)
+        assert retrieved is None
     
     def test_list_rules_enabled_only(self):
         """Test listing only enabled rules."""
@@ -302,8 +378,126 @@ class TestEmailRuleEngineAdvanced(unittest.TestCase):
         ))
         
         enabled_rules = self.engine.list_rules(enabled_only=True)
-        self.assertEqual(len(enabled_rules), 1)
-        self.assertEqual(enabled_rules[0].name, "enabled_rule")
+        assert len(enabled_rules) == 1
+        assert enabled_rules[0].name == "enabled_rule"
+    
+    def test_list_rules_enabled_only_tracks_changes(self):
+        """Test the enabled listing follows rule changes in insertion order."""
+        for name in ("a", "b", "c"):
+            self.engine.add_rule(EmailRule(name, name, "true", "queue"))
+        
+        self.engine.disable_rule("a")
+        self.engine.remove_rule("b")
+        assert [rule.name for rule in self.engine.list_rules(enabled_only=True)] == ["c"]
+        
+        self.engine.enable_rule("a")
+        assert [rule.name for rule in self.engine.list_rules(enabled_only=True)] == ["a", "c"]
+        
+        # Setting the flag directly is reflected too
+        self.engine.get_rule("c").enabled = False
+        assert [rule.name for rule in self.engine.list_rules(enabled_only=True)] == ["a"]
+        
+        self.engine.clear_rules()
+        assert self.engine.list_rules(enabled_only=True) == []
+    
+    def test_get_active_rules(self):
+        """Test that active rules are enabled, compiled and priority-ordered."""
+        self.engine.add_rules([
+            {'name': 'low', 'description': 'Low', 'condition': "priority == 'low'",
+             'action': 'queue1', 'priority': 10},
+            {'name': 'high', 'description': 'High', 'condition': "priority == 'high'",
+             'action': 'queue2', 'priority': 100},
+            {'name': 'off', 'description': 'Off', 'condition': "priority == 'normal'",
+             'action': 'queue3', 'priority': 50, 'enabled': False},
+        ])
+        
+        active_rules = self.engine.get_active_rules()
+        
+        assert [rule.name for rule, _ in active_rules] == ['high', 'low']
+        assert all(compiled is self.engine._compiled_rules[rule.name]
+                   for rule, compiled in active_rules)
+        assert self.engine.evaluate_email(self.sample_email, active_rules) == []
+    
+    def test_active_rules_order_maintained_on_insert(self):
+        """Test that priority order is kept across adds, removes and priority edits."""
+        for name, priority in [('a', 10), ('b', 50), ('c', 10), ('d', 100), ('e', 50)]:
+            self.engine.add_rule(EmailRule(
+                name=name, description=name, condition="priority == 'high'",
+                action='queue', priority=priority
+            ))
+        
+        def order():
+            return [rule.name for rule, _ in self.engine.get_active_rules()]
+        
+        assert order() == ['d', 'b', 'e', 'a', 'c']
+        
+        self.engine.remove_rule('b')
+        assert order() == ['d', 'e', 'a', 'c']
+        
+        self.engine.get_rule('c').priority = 75
+        assert order() == ['d', 'c', 'e', 'a']
+    
+    def test_first_matching_action_stops_at_first_match(self, mocker):
+        """Test that lower-priority rules are not evaluated once one matches."""
+        self.engine.add_rule(EmailRule("high", "High", "true", "high_queue", priority=100))
+        self.engine.add_rule(EmailRule("low", "Low", "1 == 1", "low_queue", priority=10))
+        low_matches = mocker.patch.object(self.engine._compiled_rules['low'], 'matches')
+        
+        assert self.engine.get_first_matching_action(self.sample_email) == "high_queue"
+        low_matches.assert_not_called()
+    
+    def test_memoize_by_message_id(self, mocker):
+        """Test that memoized results are reused and dropped when rules change."""
+        engine = EmailRuleEngine(memoize=True, memo_size=1)
+        engine.add_rule(EmailRule("memo", "Memo", "subject == 'Test Email'", "queue"))
+        matches = mocker.spy(engine._compiled_rules['memo'], 'matches')
+        
+        assert engine.evaluate_email(self.sample_email)[0].name == "memo"
+        assert engine.evaluate_email(self.sample_email)[0].name == "memo"
+        assert matches.call_count == 1
+        
+        engine.disable_rule("memo")
+        engine.enable_rule("memo")
+        engine.evaluate_email(self.sample_email)
+        assert matches.call_count == 2
+        assert len(engine._memo) == 1
+    
+    def test_memoized_rules_reevaluated_for_changed_fields(self, mocker):
+        """Test that only rules reading a changed field skip the memo."""
+        engine = EmailRuleEngine(memoize=True)
+        engine.add_rule(EmailRule("by_subject", "Subject", "subject == 'Test Email'", "a"))
+        engine.add_rule(EmailRule("by_priority", "Priority", "priority == 'normal'", "b"))
+        engine.add_rule(EmailRule("by_domain", "Domain", "not is_gmail", "c"))
+        spies = {name: mocker.spy(compiled, 'matches') for name, compiled in engine._compiled_rules.items()}
+        
+        engine.evaluate_email(self.sample_email)
+        engine.evaluate_email(self.sample_email, changed_fields={'priority'})
+        
+        assert spies['by_subject'].call_count == 1
+        assert spies['by_priority'].call_count == 2
+        assert spies['by_domain'].call_count == 2
+    
+    def test_shared_condition_matched_once_per_email(self, mocker):
+        """Test that rules with the same condition are matched once per email."""
+        condition = "subject == 'Test Email' and priority == 'normal'"
+        self.engine.add_rule(EmailRule("first", "First", condition, "a", priority=2))
+        self.engine.add_rule(EmailRule("second", "Second", condition, "b", priority=1))
+        matches = mocker.spy(self.engine._compiled_rules['first'], 'matches')
+        
+        actions = self.engine.get_all_matching_actions(self.sample_email)
+        assert actions == ["a", "b"]
+        assert matches.call_count == 1
+    
+    def test_evaluate_batch(self, mocker):
+        """Test batch evaluation resolves the active rules once."""
+        self.engine.add_rule(EmailRule("normal", "Normal", "priority == 'normal'", "a"))
+        urgent_email = EmailData.from_dict({**self.sample_email.to_dict(), 'priority': 'urgent'})
+        get_active_rules = mocker.spy(self.engine, 'get_active_rules')
+        
+        results = self.engine.evaluate_batch([self.sample_email, urgent_email])
+        
+        assert [[rule.name for rule in matches] for matches in results] == [["normal"], []]
+        assert get_active_rules.call_count == 1
     
     def test_get_all_matching_actions(self):
         """Test getting all matching actions."""
@@ -325,8 +519,8 @@ class TestEmailRuleEngineAdvanced(unittest.TestCase):
         ))
         
         actions = self.engine.get_all_matching_actions(self.sample_email)
-        self.assertIn("action1", actions)
-        self.assertIn("action2", actions)
+        assert "action1" in actions
+        assert "action2" in actions
     
     def test_import_rules_with_clear(self):
         """Test importing rules with clearing existing."""
@@ -355,8 +549,8 @@ class TestEmailRuleEngineAdvanced(unittest.TestCase):
         self.engine.import_rules(new_rules, clear_existing=True)
         
         # Should only have the new rule
-        self.assertEqual(len(self.engine.list_rules()), 1)
-        self.assertEqual(self.engine.list_rules()[0].name, 'new_rule')
+        assert len(self.engine.list_rules()) == 1
+        assert self.engine.list_rules()[0].name == 'new_rule'
     
     def test_import_rules_with_error(self):
         """Test importing rules with some invalid rules."""
@@ -382,14 +576,66 @@ class TestEmailRuleEngineAdvanced(unittest.TestCase):
         self.engine.import_rules(rules_data)
         
         # Should only import the valid rule
-        self.assertEqual(len(self.engine.list_rules()), 1)
-        self.assertEqual(self.engine.list_rules()[0].name, 'valid')
+        assert len(self.engine.list_rules()) == 1
+        assert self.engine.list_rules()[0].name == 'valid'
+    
+    def test_compile_condition_is_cached(self):
+        """Test that repeated conditions are parsed once and shared."""
+        condition = "priority == 'urgent' and subject =~ 'cached'"
+        compiled = self.engine.compile_condition(condition)
+        assert EmailRuleEngine().compile_condition(condition) is compiled
+        assert rule_engine_module._compile_condition.cache_info().hits >= 1
+    
+    def test_validate_rule_syntax_caches_failures(self, mocker):
+        """Test that invalid conditions are only parsed once."""
+        compile_condition = mocker.spy(rule_engine_module, '_compile_condition')
+        condition = "subject =~ 'unclosed"
+        assert not self.engine.validate_rule_syntax(condition)
+        assert not self.engine.validate_rule_syntax(condition)
+        assert compile_condition.call_count == 1
+        assert self.engine.validate_rule_syntax("$now > sent_date")
     
     def test_test_rule_with_error(self):
         """Test testing a rule with invalid syntax."""
         result = self.engine.test_rule("invalid syntax!!!", self.sample_email)
-        self.assertFalse(result)
+        assert not result
+
+
+class TestRuleHelpers:
+    """Test cases for the helper functions exposed to rule conditions."""
+    
+    @pytest.mark.parametrize("helper,text,other,expected", [
+        ("contains", "Urgent: Server Down", "server", True),
+        ("contains", "Urgent: Server Down", "invoice", False),
+        ("starts_with", "Urgent: Server Down", "URGENT", True),
+        ("starts_with", "Urgent: Server Down", "server", False),
+        ("ends_with", "Urgent: Server Down", "down", True),
+        ("ends_with", "Urgent: Server Down", "urgent", False),
+        ("contains", "x" * 2000 + "needle", "NEEDLE", True),
+    ])
+    def test_helper(self, helper, text, other, expected):
+        """Test the case-insensitive string helpers, cached or not."""
+        assert getattr(rule_engine_module, helper)(text, other) is expected
+    
+    def test_contains_uses_cache_for_short_text(self):
+        """Test that repeated short-text calls are served from the cache."""
+        rule_engine_module._cached_contains.cache_clear()
+        
+        for _ in range(5):
+            rule_engine_module.contains("Test Email", "test")
+        
+        info = rule_engine_module._cached_contains.cache_info()
+        assert info.misses == 1
+        assert info.hits == 4
+    
+    def test_contains_skips_cache_for_long_text(self):
+        """Test that long texts bypass the cache."""
+        rule_engine_module._cached_contains.cache_clear()
+        
+        rule_engine_module.contains("x" * 2000, "y")
+        
+        assert rule_engine_module._cached_contains.cache_info().currsize == 0
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    pytest.main([__file__])
\ No newline at end of file
@@ -2,20 +2,34 @@
 """
 Tests for the SQSClient class.
 """
-import unittest
-import sys
-from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
+import pickle
+from types import SimpleNamespace
+from unittest.mock import Mock
 from datetime import datetime
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from botocore.exceptions import ClientError
 
+from inbound_orchestrator.sqs import sqs_client as sqs_client_module
 from inbound_orchestrator.sqs.sqs_client import SQSClient, SQSQueue
 from inbound_orchestrator.models.email_model import EmailData
 
 
-class TestSQSQueue(unittest.TestCase):
+# The boto3 SQS client methods SQSClient uses; the mock rejects anything else
+SQS_CLIENT_METHODS = ['send_message', 'send_message_batch', 'get_queue_attributes']
+
+# boto3 errors raised by the mocked client, built once at import
+SEND_MESSAGE_ERROR = ClientError(
+    {'Error': {'Code': 'TestError', 'Message': 'Test error message'}},
+    'send_message'
+)
+GET_QUEUE_ATTRIBUTES_ERROR = ClientError(
+    {'Error': {'Code': 'TestError', 'Message': 'Test error message'}},
+    'get_queue_attributes'
+)
+
+
+class TestSQSQueue:
     """Test cases for SQSQueue class."""
     
     def test_queue_creation(self):
@@ -26,9 +40,9 @@ class TestSQSQueue(unittest.TestCase):
             description="Test queue"
         )
         
-        self.assertEqual(queue.name, "test_queue")
-        self.assertEqual(queue.url, "https://sqs.us-east-1.amazonaws.com/123456789012/test")
-        self.assertEqual(queue.description, "Test queue")
+        assert queue.name == "test_queue"
+        assert queue.url == "https://sqs.us-east-1.amazonaws.com/123456789012/test"
+        assert queue.description == "Test queue"
     
     def test_queue_to_dict(self):
         """Test queue to_dict conversion."""
@@ -41,8 +55,8 @@ class TestSQSQueue(unittest.TestCase):
         )
         
         queue_dict = queue.to_dict()
-        self.assertEqual(queue_dict['name'], "test_queue")
-        self.assertEqual(queue_dict['max_message_size'], 262144)
+        assert queue_dict['name'] == "test_queue"
+        assert queue_dict['max_message_size'] == 262144
     
     def test_queue_from_dict(self):
         """Test queue from_dict creation."""
@@ -53,28 +67,38 @@ class TestSQSQueue(unittest.TestCase):
         }
         
         queue = SQSQueue.from_dict(queue_dict)
-        self.assertEqual(queue.name, 'from_dict_queue')
-        self.assertEqual(queue.url, 'https://sqs.us-east-1.amazonaws.com/123456789012/dict')
+        assert queue.name == 'from_dict_queue'
+        assert queue.url == 'https://sqs.us-east-1.amazonaws.com/123456789012/dict'
+    
+    def test_queue_slots(self):
+        """Test that queues use __slots__ and still pickle and compare."""
+        queue = SQSQueue(name="test_queue", url="https://test.com/queue")
+        
+        assert not hasattr(queue, '__dict__')
+        with pytest.raises(AttributeError):
+            queue.not_a_field = True
+        
+        assert pickle.loads(pickle.dumps(queue)) == queue
 
 
-class TestSQSClient(unittest.TestCase):
+class TestSQSClient:
     """Test cases for SQSClient class."""
     
-    @patch('inbound_orchestrator.sqs.sqs_client.boto3')
-    def setUp(self, mock_boto3):
-        """Set up test fixtures."""
-        self.mock_sqs = MagicMock()
-        mock_boto3.client.return_value = self.mock_sqs
-        
-        self.client = SQSClient(region_name='us-east-1')
-        
-        self.test_queue = SQSQueue(
+    @classmethod
+    def setup_class(cls):
+        """Swap boto3 for a stub once for the whole class instead of patching per test."""
+        cls._orig_boto3 = sqs_client_module.boto3
+        cls.mock_boto3 = SimpleNamespace(client=Mock())
+        sqs_client_module.boto3 = cls.mock_boto3
+        
+        # Shared, read-only fixtures
+        cls.TEST_QUEUE = SQSQueue(
             name="test_queue",
             url="https://sqs.us-east-1.amazonaws.com/123456789012/test",
             description="Test queue"
         )
         
-        self.sample_email = EmailData(
+        cls.SAMPLE_EMAIL = EmailData(
             subject="Test Email",
             sender="test@example.com",
             recipients=["recipient@example.com"],
@@ -83,146 +107,108 @@ class TestSQSClient(unittest.TestCase):
             body_text="Test body",
             body_html=None,
             message_id="<test@example.com>",
-            received_date=datetime.now(),
-            sent_date=datetime.now(),
+            received_date=datetime(2024, 1, 1, 12, 0, 0),
+            sent_date=datetime(2024, 1, 1, 12, 0, 0),
             headers={},
             attachments=[],
             priority="normal"
         )
-    
-    @patch('inbound_orchestrator.sqs.sqs_client.boto3')
-    def test_initialization(self, mock_boto3):
-        """Test SQS client initialization."""
-        mock_sqs = MagicMock()
-        mock_boto3.client.return_value = mock_sqs
-        
-        client = SQSClient(region_name='us-west-2')
-        self.assertEqual(client.region_name, 'us-west-2')
-    
-    @patch('inbound_orchestrator.sqs.sqs_client.boto3')
-    def test_initialization_with_credentials(self, mock_boto3):
-        """Test SQS client initialization with credentials."""
-        mock_sqs = MagicMock()
-        mock_boto3.client.return_value = mock_sqs
         
-        client = SQSClient(
-            region_name='us-east-1',
-            aws_access_key_id='test_key',
-            aws_secret_access_key='test_secret'
-        )
-        self.assertIsNotNone(client.sqs)
-    
-    @patch('inbound_orchestrator.sqs.sqs_client.boto3')
-    def test_initialization_with_session_token(self, mock_boto3):
-        """Test SQS client initialization with session token."""
-        mock_sqs = MagicMock()
-        mock_boto3.client.return_value = mock_sqs
+        # One client for the class; setup_method resets its state per test
+        cls.CLIENT = SQSClient(region_name='us-east-1', sqs_client=Mock(spec=SQS_CLIENT_METHODS))
         
-        client = SQSClient(
-            region_name='us-east-1',
-            aws_access_key_id='test_key',
-            aws_secret_access_key='test_secret',
-            aws_session_token='test_token'
-        )
-        self.assertIsNotNone(client.sqs)
+        # Prepared once; tests that only inspect the output share these
+        cls.MESSAGE_BODY = cls.CLIENT._prepare_message_body(cls.SAMPLE_EMAIL)
+        cls.MESSAGE_ATTRIBUTES = cls.CLIENT._prepare_message_attributes(cls.SAMPLE_EMAIL)
     
-    def test_add_queue(self):
-        """Test adding a queue."""
-        self.client.add_queue(self.test_queue)
-        self.assertEqual(len(self.client.list_queues()), 1)
+    @classmethod
+    def teardown_class(cls):
+        """Restore the real boto3 module."""
+        sqs_client_module.boto3 = cls._orig_boto3
     
-    def test_add_queues(self):
-        """Test adding multiple queues."""
-        queues = [
-            self.test_queue,
-            SQSQueue(name="queue2", url="https://test.com/queue2", description="Queue 2")
-        ]
-        self.client.add_queues(queues)
-        self.assertEqual(len(self.client.list_queues()), 2)
-    
-    def test_remove_queue(self):
-        """Test removing a queue."""
-        self.client.add_queue(self.test_queue)
-        result = self.client.remove_queue("test_queue")
-        self.assertTrue(result)
-        self.assertEqual(len(self.client.list_queues()), 0)
-    
-    def test_remove_nonexistent_queue(self):
-        """Test removing a non-existent queue."""
-        result = self.client.remove_queue("nonexistent")
-        self.assertFalse(result)
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_sqs = Mock(spec=SQS_CLIENT_METHODS)
+        self.mock_boto3.client.reset_mock()
+        self.mock_boto3.client.return_value = self.mock_sqs
+        self.client = self.CLIENT
+        self.client.queues.clear()
+        self.client.sqs = self.mock_sqs
+        self.test_queue = self.TEST_QUEUE
+        self.sample_email = self.SAMPLE_EMAIL
     
-    def test_get_queue(self):
-        """Test getting a queue by name."""
-        self.client.add_queue(self.test_queue)
-        queue = self.client.get_queue("test_queue")
-        self.assertIsNotNone(queue)
-        self.assertEqual(queue.name, "test_queue")
+    @pytest.mark.parametrize("credentials,expected_kwargs", [
+        ({}, {}),
+        ({'aws_access_key_id': 'test_key', 'aws_secret_access_key': 'test_secret'},
+         {'aws_access_key_id': 'test_key', 'aws_secret_access_key': 'test_secret'}),
+        ({'aws_access_key_id': 'test_key', 'aws_secret_access_key': 'test_secret',
+          'aws_session_token': 'test_token'},
+         {'aws_access_key_id': 'test_key', 'aws_secret_access_key': 'test_secret',
+          'aws_session_token': 'test_token'}),
+        # A session token without keys is ignored
+        ({'aws_session_token': 'test_token'}, {}),
+    ], ids=["default", "credentials", "session_token", "token_without_keys"])
+    def test_initialization(self, credentials, expected_kwargs):
+        """Test SQS client initialization and the boto3 client arguments."""
+        client = SQSClient(region_name='us-west-2', **credentials)
+        
+        assert client.region_name == 'us-west-2'
+        assert client.sqs is self.mock_sqs
+        self.mock_boto3.client.assert_called_with(
+            'sqs', config=sqs_client_module._CLIENT_CONFIG, region_name='us-west-2', **expected_kwargs
+        )
+        assert sqs_client_module._CLIENT_CONFIG.max_pool_connections == 64
+        assert sqs_client_module._CLIENT_CONFIG.retries['mode'] == 'adaptive'
     
-    def test_get_nonexistent_queue(self):
-        """Test getting a non-existent queue."""
-        queue = self.client.get_queue("nonexistent")
-        self.assertIsNone(queue)
+    def test_initialization_with_existing_client(self):
+        """Test that an injected SQS client is reused instead of creating one."""
+        client = SQSClient(sqs_client=self.mock_sqs)
+        
+        assert client.sqs is self.mock_sqs
+        self.mock_boto3.client.assert_not_called()
     
-    def test_list_queues(self):
-        """Test listing all queues."""
+    def test_queue_registry_lifecycle(self):
+        """Test adding, listing, getting and removing queues."""
         self.client.add_queue(self.test_queue)
         queues = self.client.list_queues()
-        self.assertEqual(len(queues), 1)
-        self.assertEqual(queues[0].name, "test_queue")
-    
-    def test_send_email_message_success(self):
-        """Test sending email message successfully."""
-        self.client.add_queue(self.test_queue)
-        self.mock_sqs.send_message.return_value = {'MessageId': 'test-message-id'}
+        assert len(queues) == 1
+        assert queues[0].name == "test_queue"
         
-        result = self.client.send_email_message(
-            email_data=self.sample_email,
-            queue_name="test_queue"
-        )
+        self.client.add_queues([
+            SQSQueue(name="queue2", url="https://test.com/queue2", description="Queue 2")
+        ])
+        assert len(self.client.list_queues()) == 2
         
-        self.assertTrue(result)
-        self.mock_sqs.send_message.assert_called_once()
-    
-    def test_send_email_message_queue_not_found(self):
-        """Test sending email to non-existent queue."""
-        result = self.client.send_email_message(
-            email_data=self.sample_email,
-            queue_name="nonexistent"
-        )
+        queue = self.client.get_queue("test_queue")
+        assert queue is not None
+        assert queue.name == "test_queue"
+        assert self.client.get_queue("nonexistent") is None
         
-        self.assertFalse(result)
+        assert self.client.remove_queue("test_queue")
+        assert [q.name for q in self.client.list_queues()] == ["queue2"]
+        assert not self.client.remove_queue("nonexistent")
     
-    def test_send_email_message_with_fifo_params(self):
-        """Test sending email with FIFO queue parameters."""
+    @pytest.mark.parametrize("queue_name,send_kwargs,side_effect,expected", [
+        ("test_queue", {}, None, True),
+        ("test_queue", {'message_group_id': "group1", 'message_deduplication_id': "dedup1"}, None, True),
+        ("nonexistent", {}, None, False),
+        ("test_queue", {}, SEND_MESSAGE_ERROR, False),
+    ], ids=["success", "fifo_params", "queue_not_found", "client_error"])
+    def test_send_email_message(self, queue_name, send_kwargs, side_effect, expected):
+        """Test sending an email message and its failure modes."""
         self.client.add_queue(self.test_queue)
         self.mock_sqs.send_message.return_value = {'MessageId': 'test-message-id'}
+        self.mock_sqs.send_message.side_effect = side_effect
         
         result = self.client.send_email_message(
             email_data=self.sample_email,
-            queue_name="test_queue",
-            message_group_id="group1",
-            message_deduplication_id="dedup1"
-        )
-        
-        self.assertTrue(result)
-    
-    def test_send_email_message_client_error(self):
-        """Test handling of client error when sending message."""
-        from botocore.exceptions import ClientError
-        
-        self.client.add_queue(self.test_queue)
-        self.mock_sqs.send_message.side_effect = ClientError(
-            {'Error': {'Code': 'TestError', 'Message': 'Test error message'}},
-            'send_message'
-        )
-        
-        result = self.client.send_email_message(
-            email_data=self.sample_email,
-            queue_name="test_queue"
+            queue_name=queue_name,
+            **send_kwargs
         )
         
-        self.assertFalse(result)
+        assert result is expected
+        if queue_name == "test_queue":
+            self.mock_sqs.send_message.assert_called_once()
     
     def test_send_batch_messages_success(self):
         """Test batch sending of messages."""
@@ -239,16 +225,32 @@ class TestSQSClient(unittest.TestCase):
         
         result = self.client.send_batch_messages(messages, "test_queue")
         
-        self.assertEqual(result['success_count'], 2)
-        self.assertEqual(result['failure_count'], 0)
+        assert result['success_count'] == 2
+        assert result['failure_count'] == 0
+    
+    def test_send_batch_messages_prebuilt_entries(self):
+        """Test prebuilt entries are sent as-is in chunks of 10."""
+        self.client.add_queue(self.test_queue)
+        self.mock_sqs.send_message_batch.side_effect = lambda QueueUrl, Entries: {
+            'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []
+        }
+        entries = [{'MessageBody': '{"n": %d}' % n} for n in range(23)]
+        
+        result = self.client.send_batch_messages(entries, "test_queue")
+        
+        assert result['success_count'] == 23
+        sent = [call[1]['Entries'] for call in self.mock_sqs.send_message_batch.call_args_list]
+        assert [len(batch) for batch in sent] == [10, 10, 3]
+        assert sent[0][0] == {'Id': '0', 'MessageBody': '{"n": 0}'}
+        assert sent[2][2]['MessageBody'] == '{"n": 22}'
     
     def test_send_batch_messages_queue_not_found(self):
         """Test batch sending to non-existent queue."""
         messages = [(self.sample_email, None, None, None)]
         result = self.client.send_batch_messages(messages, "nonexistent")
         
-        self.assertEqual(result['success_count'], 0)
-        self.assertEqual(result['failure_count'], 1)
+        assert result['success_count'] == 0
+        assert result['failure_count'] == 1
     
     def test_send_batch_messages_with_failures(self):
         """Test batch sending with some failures."""
@@ -265,17 +267,17 @@ class TestSQSClient(unittest.TestCase):
         
         result = self.client.send_batch_messages(messages, "test_queue")
         
-        self.assertEqual(result['success_count'], 1)
-        self.assertEqual(result['failure_count'], 1)
-        self.assertGreater(len(result['errors']), 0)
+        assert result['success_count'] == 1
+        assert result['failure_count'] == 1
+        assert len(result['errors']) > 0
     
     def test_prepare_message_body(self):
         """Test message body preparation."""
-        message_body = self.client._prepare_message_body(self.sample_email)
+        message_body = self.MESSAGE_BODY
         
-        self.assertIn('email_data', message_body)
-        self.assertIn('timestamp', message_body)
-        self.assertEqual(message_body['message_type'], 'email_routing')
+        assert 'email_data' in message_body
+        assert 'timestamp' in message_body
+        assert message_body['message_type'] == 'email_routing'
     
     def test_prepare_message_body_with_attributes(self):
         """Test message body preparation with additional attributes."""
@@ -285,46 +287,33 @@ class TestSQSClient(unittest.TestCase):
             additional_attrs
         )
         
-        self.assertIn('additional_attributes', message_body)
-        self.assertEqual(message_body['additional_attributes']['custom_field'], 'custom_value')
+        assert 'additional_attributes' in message_body
+        assert message_body['additional_attributes']['custom_field'] == 'custom_value'
     
     def test_prepare_message_attributes(self):
         """Test message attributes preparation."""
-        attributes = self.client._prepare_message_attributes(self.sample_email)
+        attributes = self.MESSAGE_ATTRIBUTES
         
-        self.assertIn('sender', attributes)
-        self.assertIn('sender_domain', attributes)
-        self.assertIn('priority', attributes)
-        self.assertIn('has_attachments', attributes)
-        self.assertEqual(attributes['sender']['StringValue'], 'test@example.com')
+        assert 'sender' in attributes
+        assert 'sender_domain' in attributes
+        assert 'priority' in attributes
+        assert 'has_attachments' in attributes
+        assert attributes['sender']['StringValue'] == 'test@example.com'
     
-    def test_test_queue_connection_success(self):
-        """Test successful queue connection test."""
+    @pytest.mark.parametrize("queue_name,side_effect,expected", [
+        ("test_queue", None, True),
+        ("nonexistent", None, False),
+        ("test_queue", GET_QUEUE_ATTRIBUTES_ERROR, False),
+    ], ids=["success", "not_found", "error"])
+    def test_test_queue_connection(self, queue_name, side_effect, expected):
+        """Test the queue connection check."""
         self.client.add_queue(self.test_queue)
         self.mock_sqs.get_queue_attributes.return_value = {
             'Attributes': {'QueueArn': 'arn:aws:sqs:us-east-1:123456789012:test'}
         }
+        self.mock_sqs.get_queue_attributes.side_effect = side_effect
         
-        result = self.client.test_queue_connection("test_queue")
-        self.assertTrue(result)
-    
-    def test_test_queue_connection_not_found(self):
-        """Test queue connection test for non-existent queue."""
-        result = self.client.test_queue_connection("nonexistent")
-        self.assertFalse(result)
-    
-    def test_test_queue_connection_error(self):
-        """Test queue connection test with error."""
-        from botocore.exceptions import ClientError
-        
-        self.client.add_queue(self.test_queue)
-        self.mock_sqs.get_queue_attributes.side_effect = ClientError(
-            {'Error': {'Code': 'TestError', 'Message': 'Test error'}},
-            'get_queue_attributes'
-        )
-        
-        result = self.client.test_queue_connection("test_queue")
-        self.assertFalse(result)
+        assert self.client.test_queue_connection(queue_name) is expected
     
     def test_test_all_queues(self):
         """Test testing all queues."""
@@ -334,9 +323,14 @@ class TestSQSClient(unittest.TestCase):
         }
         
         results = self.client.test_all_queues()
-        self.assertIn("test_queue", results)
+        assert "test_queue" in results
     
-    def test_get_queue_attributes_success(self):
+    @pytest.mark.parametrize("queue_name,side_effect,found", [
+        ("test_queue", None, True),
+        ("nonexistent", None, False),
+        ("test_queue", Exception("Test error"), False),
+    ], ids=["success", "not_found", "error"])
+    def test_get_queue_attributes(self, queue_name, side_effect, found):
         """Test getting queue attributes."""
         self.client.add_queue(self.test_queue)
         self.mock_sqs.get_queue_attributes.return_value = {
@@ -345,24 +339,14 @@ class TestSQSClient(unittest.TestCase):
                 'VisibilityTimeout': '30'
             }
         }
+        self.mock_sqs.get_queue_attributes.side_effect = side_effect
         
-        attributes = self.client.get_queue_attributes("test_queue")
-        self.assertIsNotNone(attributes)
-        self.assertIn('QueueArn', attributes)
-    
-    def test_get_queue_attributes_not_found(self):
-        """Test getting attributes for non-existent queue."""
-        attributes = self.client.get_queue_attributes("nonexistent")
-        self.assertIsNone(attributes)
-    
-    def test_get_queue_attributes_error(self):
-        """Test getting attributes with error."""
-        self.client.add_queue(self.test_queue)
-        self.mock_sqs.get_queue_attributes.side_effect = Exception("Test error")
-        
-        attributes = self.client.get_queue_attributes("test_queue")
-        self.assertIsNone(attributes)
+        attributes = self.client.get_queue_attributes(queue_name)
+        if found:
+            assert 'QueueArn' in attributes
+        else:
+            assert attributes is None
 
 
 if __name__ == '__main__':
-    unittest.main()
+    pytest.main([__file__])